@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+카드뉴스 렌더러 벤치마크: 합성 덱(8~500장)으로 처리량·지연·메모리 측정
+
+RENDERERS의 모든 타입(cover/problem/point/comparison/summary/cta)을 돌려가며
+긴 한국어 텍스트 + images/ 이미지를 넣은 덱을 만들고,
+  html : HTML 생성 + 쓰기만 (build_deck)
+  e2e  : 생성 → Playwright 캡처 → PNG 쓰기 (run_stream, 캐시 무시)
+를 측정해 slides/sec, 슬라이드당 p50/p95, 최대 RSS를 출력·저장한다.
+
+  python bench_cards.py                       # 기본: 8,50,200,500장 × html,e2e
+  python bench_cards.py --deck-sizes 8,500 --modes html
+  python bench_cards.py --deck-sizes 50 --modes e2e --sizes square,portrait   # 렌더러 옵션은 그대로 전달
+  python bench_cards.py --compare output/_bench/bench_20260301_120000.json
+
+각 측정은 새 프로세스에서 돌려 최대 RSS가 서로 섞이지 않게 한다.
+결과는 output/_bench/bench_<시각>.json 에 저장되고, --compare로 이전 결과와 비교한다.
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import render_cards_pw as cards
+
+BENCH_DIR = os.path.join("output", "_bench")
+DEFAULT_DECK_SIZES = (8, 50, 200, 500)
+BENCH_MODES = ("html", "e2e")
+IMAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "images")
+
+
+# ──────────────────────────────────────────────
+# 합성 덱
+# ──────────────────────────────────────────────
+
+_PHRASES = (
+    "교원소청심사위원회에 처분을 안 날로부터 30일 이내에 청구해야 해요",
+    "절차적 하자가 있으면 징계 자체가 취소될 수 있어요",
+    "학교폭력 전담기구 심의 전에 사실관계를 정리해 두세요",
+    "직위해제 처분은 징계와 별개로 다툴 수 있어요",
+    "동료 교사의 진술서는 시간이 지나면 확보가 어려워져요",
+    "행정소송은 결정서를 받은 날로부터 90일 이내예요",
+    "생활상 불이익이 현저하면 재량권 일탈·남용이 인정돼요",
+    "정보공개 청구로 인사기준과 회의록을 먼저 확보하세요",
+)
+
+
+def _text(i: int, n: int, sep: str = " ") -> str:
+    """i번째 슬라이드용 긴 한국어 문장 n개"""
+    return sep.join(_PHRASES[(i + k) % len(_PHRASES)] for k in range(n))
+
+
+def _synthetic_slide(i: int, slide_type: str) -> dict:
+    if slide_type == "cover":
+        return {"type": "cover", "badge": f"교원 권리보호 {i}", "title": "부당한 처분,\n어떻게 대응하나요?",
+                "subtitle": _text(i, 2, "\n"), "highlight": "대응"}
+    if slide_type == "problem":
+        return {"type": "problem", "emoji": "😰", "main_text": "갑자기 징계 통보를\n받으셨나요?",
+                "sub_text": _text(i, 2, "\n")}
+    if slide_type == "point":
+        return {"type": "point", "number": f"{i % 100:02d}", "heading": "꼭 알아야 할\n핵심 3가지",
+                "body": "\n".join(f"{'①②③'[k]} {_PHRASES[(i + k) % len(_PHRASES)]}" for k in range(3)),
+                "highlight": "3가지"}
+    if slide_type == "comparison":
+        return {"type": "comparison", "title": "불복 절차, 이렇게 진행돼요",
+                "left_label": "1단계 · 소청심사", "left_items": [_PHRASES[(i + k) % 8][:24] for k in range(3)],
+                "right_label": "2단계 · 행정소송", "right_items": [_PHRASES[(i + k + 3) % 8][:24] for k in range(3)]}
+    if slide_type == "summary":
+        return {"type": "summary", "title": "대응 핵심 정리",
+                "items": [_PHRASES[(i + k) % len(_PHRASES)][:30] for k in range(5)]}
+    return {"type": "cta", "message": "처분 통보를 받으셨다면\n지금 바로 상담하세요",
+            "sub_message": _text(i, 2, "\n"), "contact": "070-0000-0000",
+            "handle": "@bench", "name": "벤치마크 변호사 · 교육법 전문"}
+
+
+def synthetic_deck(size: int, theme: str = "aegis_brand") -> dict:
+    """slides JSON과 같은 모양의 합성 덱 (첫 장 cover, 마지막 장 cta, 사이는 타입 순환)"""
+    types = [t for t in cards.RENDERERS if t not in ("cover", "cta")]
+    slides = [_synthetic_slide(i, "cover" if i == 0 else "cta" if i == size - 1 else types[(i - 1) % len(types)])
+              for i in range(size)]
+    return {
+        "theme": theme,
+        "prefix": "bench",
+        "footer_name": "벤치마크 변호사 · 법률사무소",
+        "footer_handle": "@bench",
+        "profile_image": {"cover": "profile1_nobg.png", "cta": "profile4_nobg.png"},
+        "logo_image": "aegis_logo.png",
+        "assets_dir": IMAGES_DIR,
+        "profile_name": "벤치마크 변호사",
+        "profile_title": "법률사무소 · 교육법 전문",
+        "slides": slides,
+    }
+
+
+# ──────────────────────────────────────────────
+# 측정
+# ──────────────────────────────────────────────
+
+def _peak_rss_mb() -> dict:
+    """이 프로세스와 자식(Chromium) 각각의 최대 RSS (MB). resource 없는 Windows면 None"""
+    try:
+        import resource
+    except ImportError:
+        return {"self": None, "children": None}
+    unit = 1024 * 1024 if sys.platform == "darwin" else 1024  # macOS는 bytes, Linux는 KB
+    return {
+        "self": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / unit, 1),
+        "children": round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / unit, 1),
+    }
+
+
+def _percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    k = (len(ordered) - 1) * pct / 100
+    lo = int(k)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def _run_case(mode: str, size: int, cli: list) -> dict:
+    """(새 프로세스에서) 덱 1개 측정. 슬라이드당 지연은 리포트 행의 단계 합계"""
+    sys.stdout = io.StringIO()  # 렌더러 진행 로그는 버림
+    args = cards._parse_args(["_", "--force"] + cli)
+    cards.load_plugins(args.plugin)
+    data = synthetic_deck(size)
+    with tempfile.TemporaryDirectory(prefix="bench_cards_") as out:
+        t0 = time.perf_counter()
+        if mode == "html":
+            job = cards.build_deck(data, out, cards._asset_registry(args), args.font, args.font_dir,
+                                   True, args.css, sizes=args.sizes)
+            rows = job["rows"]
+        else:
+            result = cards.run_stream([(data, out)], args)[0]
+            if result["error"]:
+                raise RuntimeError(result["error"])
+            rows = result["timings"]
+        wall = time.perf_counter() - t0
+    latencies = [sum(row.get(p) or 0 for p in cards.REPORT_PHASES) for row in rows]
+    return {
+        "mode": mode,
+        "slides": size,
+        "wall": round(wall, 4),
+        "slides_per_sec": round(size / wall, 2) if wall else None,
+        "p50": round(_percentile(latencies, 50), 4),
+        "p95": round(_percentile(latencies, 95), 4),
+        "rss_mb": _peak_rss_mb(),
+    }
+
+
+def run_benchmark(deck_sizes, modes, cli: list) -> list:
+    results = []
+    for mode in modes:
+        for size in deck_sizes:
+            # 측정마다 새 프로세스 → 최대 RSS가 이전 측정에 오염되지 않음
+            with ProcessPoolExecutor(max_workers=1) as pool:
+                try:
+                    row = pool.submit(_run_case, mode, size, cli).result()
+                except ImportError:
+                    print(f"  {mode:4} {size:4}장  건너뜀 (playwright 미설치)")
+                    continue
+                except Exception as e:  # noqa: BLE001
+                    print(f"  {mode:4} {size:4}장  실패: {type(e).__name__}: {e}")
+                    continue
+            results.append(row)
+            rss = row["rss_mb"]
+            print(f"  {mode:4} {size:4}장  {row['slides_per_sec']:8.1f} slides/s"
+                  f"  p50 {row['p50'] * 1000:7.1f}ms  p95 {row['p95'] * 1000:7.1f}ms"
+                  f"  RSS {rss['self']}MB (+브라우저 {rss['children']}MB)")
+    return results
+
+
+# ──────────────────────────────────────────────
+# 저장 · 비교
+# ──────────────────────────────────────────────
+
+def _git_rev() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        return ""
+
+
+def save_results(results: list, cli: list, out_dir: str = BENCH_DIR) -> str:
+    os.makedirs(out_dir, exist_ok=True)
+    path = os.path.join(out_dir, f"bench_{time.strftime('%Y%m%d_%H%M%S')}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "git": _git_rev(), "options": cli,
+                   "python": platform.python_version(), "platform": platform.platform(),
+                   "results": results}, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def compare(results: list, baseline_path: str):
+    """같은 (mode, slides) 끼리 이전 결과 대비 변화율 출력"""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    before = {(r["mode"], r["slides"]): r for r in baseline["results"]}
+    print(f"\n비교 기준: {baseline_path} ({baseline.get('git') or '?'})")
+    for row in results:
+        old = before.get((row["mode"], row["slides"]))
+        if not old:
+            continue
+        speed = (row["slides_per_sec"] / old["slides_per_sec"] - 1) * 100 if old["slides_per_sec"] else 0
+        p95 = (row["p95"] / old["p95"] - 1) * 100 if old["p95"] else 0
+        print(f"  {row['mode']:4} {row['slides']:4}장  처리량 {speed:+6.1f}%  p95 {p95:+6.1f}%")
+
+
+def main():
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+
+    parser = argparse.ArgumentParser(description="카드뉴스 렌더러 벤치마크 (합성 덱)")
+    parser.add_argument("--deck-sizes", default=",".join(map(str, DEFAULT_DECK_SIZES)),
+                        help="합성 덱 슬라이드 수 목록, 쉼표 구분 (--sizes는 렌더러 출력 규격으로 전달됨)")
+    parser.add_argument("--modes", default=",".join(BENCH_MODES), help=f"측정 모드 ({','.join(BENCH_MODES)})")
+    parser.add_argument("--compare", metavar="FILE", help="이전 bench_*.json 과 비교")
+    parser.add_argument("--no-save", action="store_true", help=f"{BENCH_DIR}에 결과 저장 안 함")
+    args, render_cli = parser.parse_known_args()  # 나머지(--font/--assets/--sizes/-w 등)는 렌더러 옵션으로 전달
+
+    deck_sizes = [int(s) for s in args.deck_sizes.split(",") if s.strip()]
+    modes = [m.strip() for m in args.modes.split(",") if m.strip() in BENCH_MODES]
+    print(f"벤치마크: {modes} × {deck_sizes}장  (렌더 옵션 {' '.join(render_cli) or '기본'})")
+    results = run_benchmark(deck_sizes, modes, render_cli)
+    if not results:
+        return 1
+    if not args.no_save:
+        print(f"\n저장: {save_results(results, render_cli)}")
+    if args.compare:
+        compare(results, args.compare)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,367 @@
+# -*- coding: utf-8 -*-
+"""
+블로그 원고 글자 수 엔진 (네이버 블로그 기준: 공백·마크다운·주석·HTML·표 구분자 제외)
+
+count_chars_temp.py의 re.sub 12단계를 그대로 옮기되
+  - 패턴은 모듈 로드 때 한 번만 컴파일
+  - 해당 기호(<, *, |, [, ━ ...)가 없는 글이면 그 단계를 건너뜀
+  - 단순 문자 제거·공백 제거는 정규식 대신 str 연산
+으로 같은 결과를 더 적은 복사로 만든다.
+단계 순서에 따른 결과(주석 안의 태그, 여러 줄에 걸친 표 구분 행 등)도 기존과 같아야 하므로
+단계는 합치지 않고 순서를 유지한다.
+
+  python blog_chars.py                    # 루트의 *_blog_*.md 전부: 파일별 섹션(##/###) 표 + 합계
+  python blog_chars.py 직위해제_*.md --skip "이미지|메타태그|품질|추천 제목"
+  python blog_chars.py --summary --json   # 파일별 합계만, JSON
+  python blog_chars.py --watch            # 저장할 때마다 바뀐 섹션만 다시 세어 합계 갱신 (Ctrl+C 종료)
+  python blog_chars.py --check            # 고정값 + 모든 *_blog_*.md 를 기존 구현과 대조
+  python -m pytest -q test_blog_chars.py  # 같은 대조 + count_chars_temp.py 총합 고정값을 pytest로
+"""
+
+import argparse
+import glob
+import hashlib
+import io
+import json
+import os
+import re
+import sys
+import time
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+
+# ──────────────────────────────────────────────
+# 카운트 규칙 (순서 중요)
+# ──────────────────────────────────────────────
+
+_COMMENT_RE = re.compile(r'<!--.*?-->', re.DOTALL)             # 이미지 주석
+_TAG_RE = re.compile(r'<[^>]+>')                                # HTML 태그
+_HEADING_RE = re.compile(r'^#{1,6}\s+', re.MULTILINE)           # 헤딩 기호
+_EMPHASIS_RE = re.compile(r'\*{1,3}(.*?)\*{1,3}')               # 굵기/기울기 (텍스트 유지)
+_QUOTE_RE = re.compile(r'^>\s*', re.MULTILINE)                  # 인용구 기호
+_TABLE_RULE_RE = re.compile(r'^\|[-|\s:]+\|$', re.MULTILINE)    # 표 구분자 행
+_HR_RE = re.compile(r'^[-=]{3,}.*$', re.MULTILINE)              # 수평선
+_HR_HEAVY_RE = re.compile(r'^[━]{3,}.*$', re.MULTILINE)
+_LINK_RE = re.compile(r'\[([^\]]+)\]\([^\)]+\)')                # 링크 → 텍스트
+
+
+def strip_markdown(text: str) -> str:
+    """count_chars가 세는 본문만 남긴 문자열 (공백은 아직 남아 있음)"""
+    if '<' in text:
+        if '<!--' in text:
+            text = _COMMENT_RE.sub('', text)
+        text = _TAG_RE.sub('', text)
+    if '#' in text:
+        text = _HEADING_RE.sub('', text)
+    if '*' in text:
+        text = _EMPHASIS_RE.sub(r'\1', text)
+    if '>' in text:
+        text = _QUOTE_RE.sub('', text)
+    if '|' in text:
+        text = _TABLE_RULE_RE.sub('', text)
+        text = text.replace('|', '')
+    if '-' in text or '=' in text:
+        text = _HR_RE.sub('', text)
+    if '━━━' in text:
+        text = _HR_HEAVY_RE.sub('', text)
+    if '[' in text:
+        text = _LINK_RE.sub(r'\1', text)
+    return text
+
+
+def count_chars(text: str) -> int:
+    """공백, 마크다운 태그, 이미지 주석, HTML 태그, 표 구분자 제외한 글자 수"""
+    # str.split()의 공백 판정은 정규식 \s (유니코드)와 같다
+    return sum(map(len, strip_markdown(text).split()))
+
+
+def _count_chars_reference(text):
+    """기존 count_chars_temp.py 구현 그대로 (--check 대조용)"""
+    text = re.sub(r'<!--.*?-->', '', text, flags=re.DOTALL)
+    text = re.sub(r'<[^>]+>', '', text)
+    text = re.sub(r'^#{1,6}\s+', '', text, flags=re.MULTILINE)
+    text = re.sub(r'\*{1,3}(.*?)\*{1,3}', r'\1', text)
+    text = re.sub(r'^>\s*', '', text, flags=re.MULTILINE)
+    text = re.sub(r'^\|[-|\s:]+\|$', '', text, flags=re.MULTILINE)
+    text = re.sub(r'\|', '', text)
+    text = re.sub(r'^[-=]{3,}.*$', '', text, flags=re.MULTILINE)
+    text = re.sub(r'^[━]{3,}.*$', '', text, flags=re.MULTILINE)
+    text = re.sub(r'\[([^\]]+)\]\([^\)]+\)', r'\1', text)
+    text = re.sub(r'\s', '', text)
+    return len(text)
+
+
+# ──────────────────────────────────────────────
+# 회귀 확인 (--check)
+# ──────────────────────────────────────────────
+
+# 기존 구현으로 센 값을 고정 (규칙이 바뀌면 여기부터 깨진다)
+PINNED_COUNTS = (
+    ("", 0),
+    ("가 나\t다\n라", 4),
+    ("<!-- 이미지1 배치 위치: 교실 -->본문", 2),
+    ("<!-- 여러\n줄 주석 -->본문<br/>끝", 3),
+    ("<a <!-- x --> b>텍스트", 3),
+    ("## 제목\n### 소제목\n#해시태그", 10),
+    ("**굵게** *기울임* ***둘다*** 별*하나", 11),
+    ("> 인용문\n>붙은 인용", 7),
+    ("| 구분 | 직위해제 | 징계 |\n|---|:---:|---|\n| 성격 | 인사조치 | 제재 |", 16),
+    ("---\n본문\n=== 제목 밑줄\n━━━━ 구분선 뒤 글\n--", 4),
+    ("[이지스](https://example.com) 상담", 5),
+    ("[닫히지 않은 링크(x)", 11),
+    ("A　B C", 3),
+)
+
+
+def check(paths: list = None) -> int:
+    """고정값 + 원고 파일을 기존 구현과 대조. 실패 건수 반환"""
+    failed = 0
+    for text, expected in PINNED_COUNTS:
+        got = count_chars(text)
+        if got != expected or _count_chars_reference(text) != expected:
+            failed += 1
+            print(f"  FAIL {text!r}: {got} (기대 {expected}, 기존 구현 {_count_chars_reference(text)})")
+    for path in paths if paths is not None else sorted(glob.glob("*_blog_*.md")):
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+        got, expected = count_chars(text), _count_chars_reference(text)
+        if got != expected:
+            failed += 1
+            print(f"  FAIL {path}: {got} (기존 구현 {expected})")
+    print(f"{'OK' if not failed else f'{failed}건 불일치'} (고정값 {len(PINNED_COUNTS)}개 + 원고 파일)")
+    return failed
+
+
+# ──────────────────────────────────────────────
+# 섹션별 카운트 (## / ### 헤딩 기준)
+# ──────────────────────────────────────────────
+
+_SECTION_RE = re.compile(r'^(#{2,3})[ \t]+(.+?)[ \t#]*$', re.MULTILINE)
+PREAMBLE_TITLE = "(도입)"  # 첫 ##/### 앞부분: # 제목 + 서론
+
+
+def split_sections(text: str) -> list:
+    """## / ### 헤딩으로 나눈 섹션 [{"title", "level", "text"}]. 헤딩 줄은 그 섹션 text에 포함"""
+    sections = []
+    starts = list(_SECTION_RE.finditer(text))
+    head = text[:starts[0].start()] if starts else text
+    if head.strip():
+        sections.append({"title": PREAMBLE_TITLE, "level": 1, "text": head})
+    for i, m in enumerate(starts):
+        end = starts[i + 1].start() if i + 1 < len(starts) else len(text)
+        sections.append({"title": m.group(2), "level": len(m.group(1)), "text": text[m.start():end]})
+    return sections
+
+
+def count_sections(text: str, skip: str = None) -> dict:
+    """섹션별 글자 수 + 합계. skip(정규식)에 걸리는 ## 섹션은 그 아래 ###까지 합계에서 뺀다"""
+    skip_re = re.compile(skip) if skip else None
+    sections = split_sections(text)
+    rows = []
+    skipping = False
+    for sec in sections:
+        if sec["level"] <= 2:
+            skipping = bool(skip_re and skip_re.search(sec["title"]))
+        rows.append({"title": sec["title"], "level": sec["level"], "chars": count_chars(sec["text"]),
+                     "skipped": skipping})
+    if skip_re:
+        total = count_chars("".join(sec["text"] for sec, row in zip(sections, rows) if not row["skipped"]))
+    else:
+        total = count_chars(text)
+    return {"sections": rows, "total": total}
+
+
+def count_file(path: str, skip: str = None) -> dict:
+    """원고 파일 1개 → {"path", "sections", "total"} (읽기 실패는 "error")"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+    except (OSError, UnicodeDecodeError) as e:
+        return {"path": path, "sections": [], "total": 0, "error": f"{type(e).__name__}: {e}"}
+    return {"path": path, **count_sections(text, skip), "error": None}
+
+
+def count_files(paths: list, skip: str = None, procs: int = 0) -> list:
+    """여러 원고를 프로세스 풀에서 동시에 → 입력 순서대로 결과 (파일이 적으면 그냥 순서대로)"""
+    procs = procs or min(len(paths), os.cpu_count() or 1)
+    if procs <= 1 or len(paths) < 4:
+        return [count_file(p, skip) for p in paths]
+    with ProcessPoolExecutor(max_workers=procs) as pool:
+        return list(pool.map(count_file, paths, [skip] * len(paths), chunksize=max(1, len(paths) // (procs * 4))))
+
+
+def _width(s: str) -> int:
+    """터미널 표시 폭 (한글 등 전각 = 2칸)"""
+    return sum(2 if unicodedata.east_asian_width(c) in "WF" else 1 for c in s)
+
+
+def _pad(s: str, width: int) -> str:
+    if _width(s) > width:
+        while s and _width(s) > width - 1:
+            s = s[:-1]
+        s += "…"
+    return s + " " * (width - _width(s))
+
+
+def print_table(results: list, summary: bool = False):
+    """파일별 섹션 표 (summary면 파일별 합계만)"""
+    title_w = 48
+    for r in results:
+        if r["error"]:
+            print(f"{r['path']}: 실패 {r['error']}")
+            continue
+        if summary:
+            print(f"{r['total']:>7,}자  {r['path']}")
+            continue
+        print(f"\n{r['path']}")
+        for row in r["sections"]:
+            indent = "  " * max(0, row["level"] - 2)
+            mark = "  (제외)" if row["skipped"] else ""
+            print(f"  {_pad(indent + row['title'], title_w)} {row['chars']:>6,}자{mark}")
+        print(f"  {_pad('합계', title_w)} {r['total']:>6,}자")
+    ok = [r for r in results if not r["error"]]
+    if len(ok) > 1:
+        print(f"\n{len(ok)}개 파일 · 전체 {sum(r['total'] for r in ok):,}자")
+
+
+# ──────────────────────────────────────────────
+# 감시 모드 (증분 재계산)
+# ──────────────────────────────────────────────
+
+class SectionIndex:
+    """원고별 섹션 카운트 인메모리 인덱스
+
+    섹션 본문 해시 → 글자 수를 파일마다 기억해 두고, 다시 읽은 파일에서
+    해시가 그대로인 섹션은 세지 않는다. 합계는 섹션 합 (count_sections의 합계와 같음).
+    """
+
+    def __init__(self, skip: str = None):
+        self.skip_re = re.compile(skip) if skip else None
+        self.files = {}  # path → {"stat", "sections": [{title, level, hash, chars, skipped}], "total"}
+
+    def update(self, path: str, stat: tuple = None) -> dict:
+        """파일을 다시 읽어 바뀐 섹션만 재계산 → {"path", "total", "delta", "changed", "recounted", "ms"}"""
+        t0 = time.perf_counter()
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+        old = self.files.get(path)
+        cached = {sec["hash"]: sec["chars"] for sec in old["sections"]} if old else {}
+        old_titles = {sec["title"]: sec["chars"] for sec in old["sections"]} if old else {}
+
+        rows = []
+        changed = []
+        recounted = 0
+        skipping = False
+        for sec in split_sections(text):
+            digest = hashlib.blake2b(sec["text"].encode("utf-8"), digest_size=16).digest()
+            chars = cached.get(digest)
+            if chars is None:
+                chars = count_chars(sec["text"])
+                recounted += 1
+                if old:  # 새로 잡힌 원고는 섹션 목록 대신 합계만
+                    changed.append((sec["title"], old_titles.get(sec["title"]), chars))
+            if sec["level"] <= 2:
+                skipping = bool(self.skip_re and self.skip_re.search(sec["title"]))
+            rows.append({"title": sec["title"], "level": sec["level"], "hash": digest, "chars": chars,
+                         "skipped": skipping})
+
+        total = sum(row["chars"] for row in rows if not row["skipped"])
+        self.files[path] = {"stat": stat, "sections": rows, "total": total}
+        return {"path": path, "total": total, "delta": total - old["total"] if old else None,
+                "changed": changed, "recounted": recounted, "ms": (time.perf_counter() - t0) * 1000}
+
+    def remove(self, path: str):
+        self.files.pop(path, None)
+
+
+def _stat(path: str):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def watch(specs: list, skip: str = None, interval: float = 0.2) -> int:
+    """원고를 감시하다 저장되면 그 파일의 바뀐 섹션만 다시 세어 출력 (Ctrl+C로 종료)
+
+    표준 라이브러리만 쓰려고 mtime/size 폴링. 대상 목록(glob)은 매 주기 다시 펼쳐 새 원고도 잡는다.
+    """
+    index = SectionIndex(skip)
+
+    def _expand():
+        return [p for spec in specs for p in (sorted(glob.glob(spec)) if glob.has_magic(spec) else [spec])]
+
+    for path in _expand():
+        stat = _stat(path)
+        if stat:
+            try:
+                index.update(path, stat)
+            except (OSError, UnicodeDecodeError) as e:
+                print(f"{path}: 실패 {type(e).__name__}: {e}")
+    print_table([{"path": p, "sections": v["sections"], "total": v["total"], "error": None}
+                 for p, v in index.files.items()], summary=True)
+    print(f"\n감시 중: {len(index.files)}개 원고 (Ctrl+C 종료)")
+
+    try:
+        while True:
+            time.sleep(interval)
+            current = set(_expand())
+            for path in list(index.files):
+                if path not in current or _stat(path) is None:
+                    index.remove(path)
+                    print(f"[{time.strftime('%H:%M:%S')}] {path}: 삭제됨")
+            for path in sorted(current):
+                stat = _stat(path)
+                if stat is None or (path in index.files and index.files[path]["stat"] == stat):
+                    continue
+                try:
+                    r = index.update(path, stat)
+                except (OSError, UnicodeDecodeError) as e:
+                    print(f"[{time.strftime('%H:%M:%S')}] {path}: 실패 {type(e).__name__}: {e}")
+                    continue
+                delta = f" ({r['delta']:+,})" if r["delta"] else ""
+                print(f"[{time.strftime('%H:%M:%S')}] {path}: 합계 {r['total']:,}자{delta}"
+                      f" · 재계산 {r['recounted']}개 섹션 · {r['ms']:.1f}ms")
+                for title, before, after in r["changed"]:
+                    print(f"    {title}: {'새 섹션' if before is None else f'{before:,}'} → {after:,}자")
+    except KeyboardInterrupt:
+        return 0
+
+
+def main(argv=None) -> int:
+    # --watch 출력이 바로 보이도록 줄 단위 flush
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace', line_buffering=True)
+
+    parser = argparse.ArgumentParser(description="블로그 원고 글자 수 (섹션별 + 합계)")
+    parser.add_argument("paths", nargs="*", help="원고 .md 파일 또는 glob (기본 *_blog_*.md)")
+    parser.add_argument("--skip", default=None, help="합계에서 뺄 ## 섹션 제목 정규식 (예: \"이미지|메타태그\")")
+    parser.add_argument("--summary", action="store_true", help="섹션 없이 파일별 합계만")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    parser.add_argument("--procs", type=int, default=0, help="동시 처리 프로세스 수 (기본 CPU 수)")
+    parser.add_argument("--check", action="store_true", help="고정값 + 원고를 기존 구현과 대조")
+    parser.add_argument("--watch", action="store_true", help="저장될 때마다 바뀐 섹션만 다시 세어 출력")
+    parser.add_argument("--interval", type=float, default=0.2, help="--watch 확인 주기 (초, 기본 0.2)")
+    args = parser.parse_args(argv)
+
+    if args.watch:
+        return watch(args.paths or ["*_blog_*.md"], args.skip, args.interval)
+
+    paths = [p for spec in (args.paths or ["*_blog_*.md"])
+             for p in (sorted(glob.glob(spec)) if glob.has_magic(spec) else [spec])]
+    if args.check:
+        return 1 if check(paths if args.paths else None) else 0
+    if not paths:
+        print("대상 원고 없음")
+        return 1
+
+    results = count_files(paths, args.skip, args.procs)
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+    else:
+        print_table(results, args.summary)
+    return 1 if any(r["error"] for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
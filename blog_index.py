@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+"""
+블로그 원고 코퍼스 인덱스: 키워드 밀도 · 중복 문단 분석
+
+count_chars와 같은 마크다운 제거(strip_markdown)를 거친 본문으로
+  - 공백 뺀 본문 (부분 문자열 키워드 검색: 조사가 붙은 형태까지 str.count로)
+  - 어절 빈도 → 역색인 어절 → {원고: 횟수} (정확히 그 어절로 쓰인 횟수, 과다 사용 어절 찾기)
+  - 문단별 문자 5-gram 싱글(crc32) 집합 (문단 단위 근사 중복)
+을 만들어 _blog_index.json 에 저장한다. 원고는 mtime/size가 바뀐 것만 다시 색인한다.
+
+  python blog_index.py build                      # 색인 갱신 (바뀐 원고만)
+  python blog_index.py keyword 소청심사 직위해제    # 원고별 출현 횟수·밀도
+  python blog_index.py top -n 30                  # 코퍼스 전체 어절 빈도 상위
+  python blog_index.py dupes --threshold 0.6      # 서로 다른 원고 간 비슷한 문단
+  python blog_index.py keyword 직위해제 --paths "2024_*.md" --json   # 공통 옵션은 명령 앞뒤 어디든
+
+--paths로 범위를 좁혀도 색인에서 다른 원고를 지우지 않는다 (질의만 그 범위로). 파일이 사라진 원고만 제거.
+"""
+
+import argparse
+import glob
+import io
+import json
+import os
+import re
+import sys
+import time
+import zlib
+from collections import Counter, defaultdict
+
+from blog_chars import count_chars, strip_markdown
+
+INDEX_NAME = "_blog_index.json"
+INDEX_VERSION = 1
+DEFAULT_GLOB = "*_blog_*.md"
+SHINGLE = 5            # 문단 싱글 길이 (공백 제거 후 문자 수)
+MIN_PARAGRAPH = 40     # 이보다 짧은 문단은 중복 비교에서 제외 (헤딩·목록 한 줄 등)
+
+_TOKEN_RE = re.compile(r'[0-9A-Za-z가-힣]+')
+_PARAGRAPH_RE = re.compile(r'\n\s*\n')
+
+
+# ──────────────────────────────────────────────
+# 원고 1개 색인
+# ──────────────────────────────────────────────
+
+def _squash(text: str) -> str:
+    """공백 제거 (count_chars가 세는 문자열과 같음)"""
+    return "".join(text.split())
+
+
+def _shingles(squashed: str) -> list:
+    """문자 SHINGLE-gram → crc32 정수 집합 (정렬 리스트). 실행마다 같은 값이어야 하므로 hash() 대신 crc32"""
+    return sorted({zlib.crc32(squashed[i:i + SHINGLE].encode("utf-8"))
+                   for i in range(max(1, len(squashed) - SHINGLE + 1))})
+
+
+def index_document(text: str) -> dict:
+    """원고 본문 → 색인 항목 (본문·어절 빈도·문단 싱글)"""
+    body = strip_markdown(text)
+    paragraphs = []
+    for raw in _PARAGRAPH_RE.split(text):
+        squashed = _squash(strip_markdown(raw))
+        if len(squashed) >= MIN_PARAGRAPH:
+            paragraphs.append({"text": " ".join(raw.split())[:120], "shingles": _shingles(squashed)})
+    return {
+        "chars": count_chars(text),
+        "body": _squash(body),
+        "tokens": Counter(_TOKEN_RE.findall(body)),
+        "paragraphs": paragraphs,
+    }
+
+
+# ──────────────────────────────────────────────
+# 코퍼스 인덱스
+# ──────────────────────────────────────────────
+
+class CorpusIndex:
+    """_blog_index.json 에 저장되는 원고별 색인 + 메모리 역색인(어절 → 원고별 횟수)"""
+
+    def __init__(self, path: str = INDEX_NAME):
+        self.path = path
+        self.docs = {}
+        self.selected = None  # 질의 범위 (update에 넘긴 원고). None이면 색인 전체
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == INDEX_VERSION:
+                self.docs = data["docs"]
+        except (OSError, ValueError):
+            pass
+        self._postings = None
+
+    def update(self, paths: list) -> dict:
+        """paths 중 바뀐 원고만 다시 색인하고 질의 범위를 paths로 → {"indexed", "removed", "seconds"}
+
+        paths 밖의 원고는 그대로 두고, 파일이 없어진 원고만 색인에서 뺀다.
+        """
+        t0 = time.perf_counter()
+        indexed = []
+        for path in paths:
+            st = os.stat(path)
+            stat = [st.st_mtime_ns, st.st_size]
+            doc = self.docs.get(path)
+            if doc and doc["stat"] == stat:
+                continue
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self.docs[path] = {"stat": stat, **index_document(f.read())}
+            except (OSError, UnicodeDecodeError) as e:
+                print(f"  실패 {path}: {type(e).__name__}: {e}")
+                continue
+            indexed.append(path)
+        self.selected = set(paths) & set(self.docs)
+        removed = [p for p in self.docs if not os.path.isfile(p)]
+        for path in removed:
+            del self.docs[path]
+        if indexed or removed:
+            self._postings = None
+            self.save()
+        return {"indexed": indexed, "removed": removed, "seconds": round(time.perf_counter() - t0, 4)}
+
+    def save(self):
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": INDEX_VERSION, "docs": self.docs}, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+
+    @property
+    def postings(self) -> dict:
+        """어절 → {원고: 횟수} (원고별 어절 빈도에서 메모리로 만듦)"""
+        if self._postings is None:
+            self._postings = defaultdict(dict)
+            for path, doc in self.docs.items():
+                for tok, c in doc["tokens"].items():
+                    self._postings[tok][path] = c
+        return self._postings
+
+    def _scope(self):
+        """질의 범위의 (원고, 색인 항목)"""
+        return [(path, doc) for path, doc in self.docs.items() if self.selected is None or path in self.selected]
+
+    def keyword(self, term: str) -> list:
+        """원고별 출현 횟수(조사가 붙은 형태 포함)·어절 그대로 쓰인 횟수·밀도(1,000자당)"""
+        term = _squash(term)
+        exact = self.postings.get(term, {})
+        rows = []
+        for path, doc in self._scope():
+            n = doc["body"].count(term)
+            if n:
+                rows.append({"path": path, "count": n, "exact": exact.get(path, 0), "chars": doc["chars"],
+                             "per_1000": round(n * 1000 / doc["chars"], 2) if doc["chars"] else 0.0})
+        return sorted(rows, key=lambda r: -r["per_1000"])
+
+    def top_tokens(self, n: int = 30, min_len: int = 2) -> list:
+        total = Counter()
+        for _, doc in self._scope():
+            total.update(doc["tokens"])
+        return [(tok, c) for tok, c in total.most_common() if len(tok) >= min_len][:n]
+
+    def duplicates(self, threshold: float = 0.6, same_doc: bool = False) -> list:
+        """싱글 자카드 유사도 threshold 이상인 문단 쌍 (싱글 역색인으로 후보만 비교)"""
+        paras = [(path, i, set(p["shingles"]), p["text"])
+                 for path, doc in self._scope() for i, p in enumerate(doc["paragraphs"])]
+        postings = defaultdict(list)
+        for pid, (_, _, shingles, _) in enumerate(paras):
+            for s in shingles:
+                postings[s].append(pid)
+
+        pairs = []
+        for a, (path_a, _, sh_a, text_a) in enumerate(paras):
+            shared = Counter(b for s in sh_a for b in postings[s] if b > a)
+            for b, inter in shared.items():
+                path_b, _, sh_b, text_b = paras[b]
+                if path_a == path_b and not same_doc:
+                    continue
+                # 자카드 상한(작은 집합/큰 집합)으로 먼저 거른 뒤 계산
+                if min(len(sh_a), len(sh_b)) / max(len(sh_a), len(sh_b)) < threshold:
+                    continue
+                score = inter / (len(sh_a) + len(sh_b) - inter)
+                if score >= threshold:
+                    pairs.append({"score": round(score, 3), "a": path_a, "b": path_b,
+                                  "a_text": text_a, "b_text": text_b})
+        return sorted(pairs, key=lambda p: -p["score"])
+
+
+def _expand(specs: list) -> list:
+    return sorted({p for spec in specs for p in (glob.glob(spec) if glob.has_magic(spec) else [spec])
+                   if os.path.isfile(p)})
+
+
+def _add_common_options(parser, defaults: bool = True):
+    """--paths/--index/--json. 명령 앞(최상위)과 뒤(하위 명령) 모두 받되,
+    하위 명령 쪽은 기본값 없이(SUPPRESS) 둬야 앞에서 준 값을 덮어쓰지 않는다"""
+    def default(value):
+        return value if defaults else argparse.SUPPRESS
+
+    parser.add_argument("--paths", action="append", metavar="GLOB", default=default(None),
+                        help=f"대상 원고 glob, 여러 개면 반복 (기본 {DEFAULT_GLOB})")
+    parser.add_argument("--index", default=default(INDEX_NAME), help=f"색인 파일 (기본 {INDEX_NAME})")
+    parser.add_argument("--json", action="store_true", default=default(False), help="결과를 JSON으로 출력")
+    return parser
+
+
+def main(argv=None) -> int:
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+
+    shared = _add_common_options(argparse.ArgumentParser(add_help=False), defaults=False)
+    parser = _add_common_options(argparse.ArgumentParser(description="블로그 원고 코퍼스 인덱스 (키워드 밀도 · 중복 문단)"))
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("build", parents=[shared], help="색인 갱신 (바뀐 원고만)")
+    kw = sub.add_parser("keyword", parents=[shared], help="키워드 원고별 출현 횟수·밀도")
+    kw.add_argument("terms", nargs="+")
+    top = sub.add_parser("top", parents=[shared], help="코퍼스 전체 어절 빈도 상위")
+    top.add_argument("-n", type=int, default=30)
+    dup = sub.add_parser("dupes", parents=[shared], help="원고 간 비슷한 문단")
+    dup.add_argument("--threshold", type=float, default=0.6, help="싱글 자카드 유사도 하한 (기본 0.6)")
+    dup.add_argument("--same-doc", action="store_true", help="같은 원고 안의 중복도 포함")
+    args = parser.parse_args(argv)
+
+    index = CorpusIndex(args.index)
+    stats = index.update(_expand(args.paths or [DEFAULT_GLOB]))
+
+    t0 = time.perf_counter()
+    if args.command == "build":
+        result = {"docs": len(index.docs), **stats}
+    elif args.command == "keyword":
+        result = {term: index.keyword(term) for term in args.terms}
+    elif args.command == "top":
+        result = index.top_tokens(args.n)
+    else:
+        result = index.duplicates(args.threshold, args.same_doc)
+    query_ms = (time.perf_counter() - t0) * 1000
+
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+        return 0
+
+    print(f"색인 {len(index.docs)}개 원고 (질의 범위 {len(index.selected)}) · 갱신 {len(stats['indexed'])} · 제거 {len(stats['removed'])}"
+          f" ({stats['seconds'] * 1000:.1f}ms) · 질의 {query_ms:.1f}ms")
+    if args.command == "keyword":
+        for term, rows in result.items():
+            print(f"\n'{term}': {len(rows)}개 원고 · 총 {sum(r['count'] for r in rows)}회")
+            for r in rows:
+                print(f"  {r['count']:>4}회 (어절 그대로 {r['exact']:>3})  {r['per_1000']:>6.2f}/1000자  {r['path']}")
+    elif args.command == "top":
+        for tok, c in result:
+            print(f"  {c:>6}  {tok}")
+    elif args.command == "dupes":
+        for p in result:
+            print(f"\n  {p['score']:.2f}  {p['a']}  ↔  {p['b']}")
+            print(f"        {p['a_text']}")
+            print(f"        {p['b_text']}")
+        print(f"\n{len(result)}쌍")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,428 @@
+#!/usr/bin/env python3
+"""
+카드뉴스 레이아웃 사전 점검: 브라우저 없이 slides JSON의 글자 넘침 추정
+
+굵기별 글자 폭(advance width) 표와 _base_css의 줄바꿈 규칙
+(word-break: keep-all → 공백에서만 줄바꿈, overflow-wrap: break-word → 너무 긴 어절은 쪼갬)으로
+슬라이드 타입별 본문 블록의 줄 수·높이를 계산하고, 푸터(problem은 스와이프 안내) 위 여백을
+넘는 슬라이드를 찾는다 (렌더러 자동 맞춤 _AUTOFIT_JS와 같은 기준). 덱 수십 개도 수 밀리초라 Chromium을 띄우기 전에 돌린다.
+
+  python card_precheck.py                          # ./*_slides.json
+  python card_precheck.py decks/ other_slides.json --json
+  python card_precheck.py --autofit                # 자동 맞춤(--autofit)으로 맞출 수 있으면 경고만
+  python card_precheck.py --build-metrics fonts    # Pretendard 파일에서 정밀 폭 표 생성 (fontTools)
+
+폭 표는 pretendard_metrics.json(--build-metrics 결과, Pretendard 실측)이 있으면 그것을,
+없으면 내장 근사치(Pretendard 실측 아님)를 쓰고 출력에 그렇게 표시한다.
+근사치는 한글 ±3%, 라틴 ±8% 정도라 경계에 걸린 슬라이드는 --margin으로 여유를 두고 본다.
+"""
+
+import argparse
+import glob
+import io
+import json
+import math
+import os
+import re
+import statistics
+import sys
+import time
+
+from render_cards_pw import AUTOFIT_MIN, CARD_SIZE, PRETENDARD_WEIGHTS, _deck_meta, _find_font_file
+
+METRICS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pretendard_metrics.json")
+DEFAULT_GLOB = "*_slides.json"
+
+PADDING = 80                       # body padding
+CONTENT_WIDTH = CARD_SIZE - 2 * PADDING
+FIT_GAP = 16                       # 본문 블록과 푸터·스와이프 안내 사이 최소 여백 (자동 맞춤 JS와 같음)
+
+_BR_RE = re.compile(r"\\n|\n")     # _nl과 같은 줄바꿈 (JSON 안의 "\\n" 문자열 포함)
+
+
+# ──────────────────────────────────────────────
+# 글자 폭 표
+# ──────────────────────────────────────────────
+
+# 내장 근사치 (em). 라틴은 Inter 계열 Regular 기준 묶음 값, 굵기마다 _LATIN_BOLDER 배율로 넓힌다
+_APPROX_GROUPS = (
+    (" ", 0.27),
+    ("iIjl.,:;'!|", 0.26),
+    ("frt()[]{}\"/\\", 0.37),
+    ("-", 0.44),
+    ("sczvxyk?", 0.53),
+    ("abdeghnopqu_#$*+<=>^~`", 0.58),
+    ("0123456789", 0.60),
+    ("ABCDEFGHJKLNOPQRSTUVXYZ&", 0.68),
+    ("mw%", 0.85),
+    ("MW@", 0.92),
+    ("·", 0.30),
+    ("…", 0.90),
+    ("→←↑↓", 0.83),
+    ("◆✓☎", 1.0),
+)
+_LATIN_BOLDER = {400: 1.0, 600: 1.04, 700: 1.06, 800: 1.08, 900: 1.10}
+_APPROX_HANGUL = 0.92
+_APPROX_LINE = 1.2
+
+
+def _approx_metrics() -> dict:
+    weights = {}
+    for weight, bolder in _LATIN_BOLDER.items():
+        chars = {}
+        for group, em in _APPROX_GROUPS:
+            for ch in group:
+                chars[ch] = round(em * bolder, 4) if ord(ch) < 0x2000 else em
+        weights[weight] = {"line": _APPROX_LINE, "hangul": _APPROX_HANGUL, "chars": chars}
+    return {"source": "builtin-approx", "weights": weights}
+
+
+def build_metrics(font_dir: str, out: str = METRICS_PATH) -> dict:
+    """font_dir의 Pretendard-*.woff2/otf/ttf → 굵기별 폭 표 JSON (fontTools 필요, woff2면 brotli도)"""
+    from fontTools.ttLib import TTFont
+
+    weights = {}
+    for weight, name in PRETENDARD_WEIGHTS.items():
+        path = _find_font_file(font_dir, name)
+        if not path:
+            continue
+        font = TTFont(path)
+        upm = font["head"].unitsPerEm
+        cmap = font.getBestCmap()
+        hmtx = font["hmtx"].metrics
+        hhea = font["hhea"]
+        hangul = [hmtx[cmap[cp]][0] for cp in range(0xAC00, 0xD7A4) if cp in cmap]
+        weights[weight] = {
+            "line": round((hhea.ascent - hhea.descent + hhea.lineGap) / upm, 4),
+            "hangul": round(statistics.median(hangul) / upm, 4) if hangul else _APPROX_HANGUL,
+            # 한글 음절·CJK는 폭이 고정이라 hangul 하나로, 나머지(라틴·기호·전각 구두점)만 글자별로
+            "chars": {chr(cp): round(hmtx[g][0] / upm, 4) for cp, g in cmap.items()
+                      if cp < 0x3000 or 0xFF00 <= cp <= 0xFFEF},
+        }
+    if not weights:
+        raise FileNotFoundError(f"{font_dir} 에 Pretendard 파일이 없습니다")
+    metrics = {"source": os.path.abspath(font_dir), "weights": weights}
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(metrics, f, ensure_ascii=False)
+    return metrics
+
+
+def load_metrics(path: str = METRICS_PATH) -> dict:
+    """--build-metrics 결과가 있으면 그것, 없거나 깨졌으면 내장 근사치"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            metrics = json.load(f)
+        metrics["weights"] = {int(w): m for w, m in metrics["weights"].items()}
+        return metrics
+    except (OSError, ValueError, KeyError, AttributeError):
+        return _approx_metrics()
+
+
+def _is_approx(metrics: dict) -> bool:
+    return metrics["source"] == "builtin-approx"
+
+
+def _weight_metrics(metrics: dict, weight: int) -> dict:
+    """가장 가까운 굵기의 표 (표에 없는 굵기를 요청해도 동작)"""
+    weights = metrics["weights"]
+    return weights.get(weight) or weights[min(weights, key=lambda w: abs(w - weight))]
+
+
+def _advance(ch: str, wm: dict) -> float:
+    em = wm["chars"].get(ch)
+    if em is not None:
+        return em
+    cp = ord(ch)
+    if 0xAC00 <= cp <= 0xD7A3 or 0x3130 <= cp <= 0x318F:
+        return wm["hangul"]
+    if cp >= 0x1F000 or 0x2600 <= cp <= 0x27BF:
+        return 1.25                       # 이모지 (대체 글꼴, 대개 1em보다 넓음)
+    return 1.0                            # 그 밖의 CJK·전각 기호
+
+
+# ──────────────────────────────────────────────
+# 줄바꿈 (keep-all + break-word)
+# ──────────────────────────────────────────────
+
+class Typesetter:
+    """(굵기, 크기, 자간) 스타일별로 어절 폭을 재고 줄 수를 센다"""
+
+    def __init__(self, metrics: dict):
+        self.metrics = metrics
+        self._words = {}
+
+    def width(self, text: str, size: float, weight: int, spacing: float = 0.0) -> float:
+        key = (text, size, weight, spacing)
+        if key not in self._words:
+            wm = _weight_metrics(self.metrics, weight)
+            self._words[key] = sum(_advance(ch, wm) for ch in text) * size + spacing * len(text)
+        return self._words[key]
+
+    def lines(self, text, width: float, size: float, weight: int, spacing: float = 0.0) -> int:
+        """text(\\n은 <br>)가 폭 width에서 차지하는 줄 수. 빈 문자열은 0"""
+        text = str(text or "")
+        if not text:
+            return 0
+        space = self.width(" ", size, weight, spacing)
+        count = 0
+        for para in _BR_RE.split(text):
+            count += 1
+            line = 0.0
+            for i, word in enumerate(para.split(" ")):
+                w = self.width(word, size, weight, spacing)
+                if i and line + space + w <= width:
+                    line += space + w
+                    continue
+                if i and line:
+                    count += 1
+                # 한 줄보다 긴 어절은 break-word로 쪼개진다
+                extra = max(0, math.ceil(w / width) - 1) if width > 0 else 0
+                count += extra
+                line = w - extra * width
+        return count
+
+    def height(self, text, width: float, size: float, weight: int, line_height: float = None,
+               spacing: float = 0.0) -> float:
+        """블록 높이 = 줄 수 × 줄 높이 (line_height None이면 폰트 기본 normal)"""
+        lh = line_height or _weight_metrics(self.metrics, weight)["line"]
+        return self.lines(text, width, size, weight, spacing) * size * lh
+
+    def line(self, size: float, weight: int = 400) -> float:
+        return size * _weight_metrics(self.metrics, weight)["line"]
+
+
+# ──────────────────────────────────────────────
+# 슬라이드 타입별 레이아웃 (render_cards_pw의 slide_* CSS 수치)
+# ──────────────────────────────────────────────
+
+def _footer_top(ts: Typesetter) -> float:
+    """.footer { bottom: 40px; padding-top: 16px; border-top: 1px; font-size: 16px }"""
+    return CARD_SIZE - 40 - ts.line(16) - 16 - 1
+
+
+def _layout_cover(s: dict, ts: Typesetter, k: float) -> dict:
+    width = 600                                                      # .content max-width
+    badge = ts.height(s.get("badge"), width - 48 - 2 - 14 - 8, 22, 700, spacing=1) + 20 + 2
+    title = ts.height(s.get("title"), width, 52 * k, 900, 1.35, -1.5)
+    sub = ts.height(s.get("subtitle"), width, 28 * k, 400, 1.75, 0.3)
+    bottom = PADDING + 120 + 4 + 36 + badge + 36 + title + 32 + sub
+    return {"top": PADDING, "bottom": bottom, "limit": _footer_top(ts) - FIT_GAP,
+            "fields": {"title": title, "subtitle": sub}}
+
+
+def _layout_problem(s: dict, ts: Typesetter, k: float) -> dict:
+    main = ts.height(s.get("main_text"), CONTENT_WIDTH, 44 * k, 900, 1.45, -1.5)
+    sub = ts.height(s.get("sub_text"), CONTENT_WIDTH, 28 * k, 400, 1.75, 0.3)
+    bottom = PADDING + 200 + 120 + 40 + main + 32 + sub
+    swipe_top = CARD_SIZE - 100 - ts.line(16)                        # .swipe-hint { bottom: 100px }
+    return {"top": PADDING, "bottom": bottom, "limit": swipe_top - FIT_GAP,
+            "fields": {"main_text": main, "sub_text": sub}}
+
+
+def _layout_point(s: dict, ts: Typesetter, k: float) -> dict:
+    heading = ts.height(s.get("heading"), CONTENT_WIDTH, 44 * k, 900, 1.35, -1.5)
+    # .body-card: padding 32px 36px, border 1px, border-left 4px
+    body = ts.height(s.get("body"), CONTENT_WIDTH - 72 - 4 - 1, 28 * k, 400, 1.75, 0.3)
+    bottom = PADDING + 180 + 56 + 36 + heading + 28 + 64 + 2 + body
+    return {"top": PADDING, "bottom": bottom, "limit": _footer_top(ts) - FIT_GAP,
+            "fields": {"heading": heading, "body": body}}
+
+
+def _layout_comparison(s: dict, ts: Typesetter, k: float) -> dict:
+    col_width = (CONTENT_WIDTH - 20) / 2
+    item_width = col_width - 40 - 2 - 24 - 12                        # padding · border · .item-num · gap
+
+    def column(label, items):
+        height = 32 + ts.height(label, col_width - 2, 24, 700) + 2 + 18
+        for item in items or ():
+            height += 32 + 2 + max(26, ts.height(item, item_width, 24 * k, 400, 1.6)) + 10
+        return height
+
+    title = ts.height(s.get("title"), CONTENT_WIDTH, 40 * k, 900, None, -1.5)
+    left = column(s.get("left_label"), s.get("left_items"))
+    right = column(s.get("right_label"), s.get("right_items"))
+    bottom = PADDING + 100 + 4 + 36 + title + 44 + max(left, right)
+    return {"top": PADDING, "bottom": bottom, "limit": _footer_top(ts) - FIT_GAP,
+            "fields": {"title": title, "left_items": left, "right_items": right}}
+
+
+def _layout_summary(s: dict, ts: Typesetter, k: float) -> dict:
+    text_width = CONTENT_WIDTH - 48 - 2 - 36 - 18 - 14 - 10          # padding · border · 배지 · gap · ✓ · gap
+    title = ts.height(s.get("title"), CONTENT_WIDTH, 42 * k, 900, None, -1.5)
+    items = sum(42 + max(36, 4 + ts.height(item, text_width, 26 * k, 400, 1.6, 0.3)) + 10
+                for item in s.get("items") or ())
+    bottom = PADDING + 100 + 4 + 36 + title + 40 + items
+    return {"top": PADDING, "bottom": bottom, "limit": _footer_top(ts) - FIT_GAP,
+            "fields": {"title": title, "items": items}}
+
+
+def _layout_cta(s: dict, ts: Typesetter, k: float) -> dict:
+    layout_height = 920                                              # .cta-layout (세로 가운데 정렬)
+    if s.get("_profile"):
+        width, h2, sub, gaps, box_pad, handle = 470, 38, 24, (24, 36), 56, 18  # .cta-right
+        margin_top = 0
+    else:
+        width, h2, sub, gaps, box_pad, handle = CONTENT_WIDTH, 42, 22, (28, 48), 64, 20  # .cta-center
+        margin_top = 160
+    message = ts.height(s.get("message"), width, h2 * k, 900, 1.45, -1.5)
+    sub_message = ts.height(s.get("sub_message"), width, sub * k, 400, 1.75, 0.3)
+    box = (box_pad + 2 + ts.height(s.get("name"), width - box_pad - 2, 22, 400) + 16
+           + 32 + 2 + ts.line(30, 900) + 12 + ts.line(handle, 600))
+    height = message + gaps[0] + sub_message + gaps[1] + box
+    # align-items: center → 마진 포함 블록이 920px 안에서 가운데
+    top = PADDING + (layout_height - height - margin_top) / 2 + margin_top
+    return {"top": top, "bottom": top + height, "limit": _footer_top(ts) - FIT_GAP,
+            "fields": {"message": message, "sub_message": sub_message}}
+
+
+LAYOUTS = {
+    "cover": _layout_cover,
+    "problem": _layout_problem,
+    "point": _layout_point,
+    "comparison": _layout_comparison,
+    "summary": _layout_summary,
+    "cta": _layout_cta,
+}
+
+
+def _overflow(box: dict) -> float:
+    return max(box["bottom"] - box["limit"], -box["top"], 0.0)
+
+
+def check_slide(slide: dict, ts: Typesetter, margin: float = 0.0, autofit_min: float = AUTOFIT_MIN) -> dict:
+    """슬라이드 1장 → {"type", "bottom", "limit", "overflow", "fit_scale", "fields"}
+
+    fit_scale: 넘칠 때 자동 맞춤(같은 글자 크기 배율)으로 맞추려면 필요한 배율 추정. 최소 배율로도 안 되면 None
+    """
+    layout = LAYOUTS.get(slide.get("type", "point"), _layout_point)  # 모르는 타입은 렌더러처럼 point
+    box = layout(slide, ts, 1.0)
+    box["limit"] -= margin
+    over = _overflow(box)
+    result = {"type": slide.get("type", "point"), "bottom": round(box["bottom"], 1), "limit": round(box["limit"], 1),
+              "overflow": round(over, 1), "fit_scale": 1.0 if not over else None,
+              "fields": {k: round(v, 1) for k, v in box["fields"].items()}}
+    if over:
+        def fits(k):
+            b = layout(slide, ts, k)
+            b["limit"] -= margin
+            return not _overflow(b)
+
+        if fits(autofit_min):
+            lo, hi = autofit_min, 1.0
+            for _ in range(8):
+                mid = (lo + hi) / 2
+                lo, hi = (mid, hi) if fits(mid) else (lo, mid)
+            result["fit_scale"] = round(lo, 3)
+    return result
+
+
+def check_deck(data, ts: Typesetter, margin: float = 0.0, autofit_min: float = AUTOFIT_MIN) -> list:
+    """slides JSON → 슬라이드별 점검 결과 (렌더러와 같은 파일명 prefix_NN_type)"""
+    meta = _deck_meta(data)
+    has_profile = isinstance(meta["profile_image"], dict) and bool(meta["profile_image"].get("cta"))
+    results = []
+    for idx, slide in enumerate(meta["slides"]):
+        slide_type = slide.get("type", "point")
+        row = check_slide({**slide, "_profile": has_profile}, ts, margin, autofit_min)
+        results.append({"slide": idx + 1, "name": f"{meta['prefix']}_{idx + 1:02d}_{slide_type}", **row})
+    return results
+
+
+def _expand(specs: list) -> list:
+    """파일·폴더·glob → slides JSON 목록. 직접 적은 경로는 없어도 남겨 두어 덱 오류로 보고되게 한다"""
+    paths = set()
+    for spec in specs:
+        if os.path.isdir(spec):
+            paths.update(glob.glob(os.path.join(spec, "**", DEFAULT_GLOB), recursive=True))
+        elif glob.has_magic(spec):
+            paths.update(glob.glob(spec))
+        else:
+            paths.add(spec)
+    return sorted(paths)
+
+
+def main(argv=None) -> int:
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+
+    parser = argparse.ArgumentParser(description="카드뉴스 글자 넘침 사전 점검 (브라우저 없이, 글자 폭은 "
+                                                 "--build-metrics로 만든 Pretendard 실측 표 또는 내장 근사치)")
+    parser.add_argument("paths", nargs="*", default=[DEFAULT_GLOB],
+                        help=f"slides JSON 파일·폴더·glob (폴더는 하위 {DEFAULT_GLOB}, 기본 ./{DEFAULT_GLOB})")
+    parser.add_argument("--margin", type=float, default=0.0, help="푸터 위 여백을 이만큼(px) 더 요구 (근사 오차 대비)")
+    parser.add_argument("--autofit", nargs="?", type=float, const=AUTOFIT_MIN, default=None, metavar="MIN",
+                        help="렌더러 --autofit으로 맞출 수 있는 넘침은 경고만 (실패로 치지 않음)")
+    parser.add_argument("--all", action="store_true", help="문제 없는 슬라이드도 출력")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    parser.add_argument("--metrics", default=METRICS_PATH,
+                        help="글자 폭 표 JSON (기본 pretendard_metrics.json, 없으면 내장 근사치)")
+    parser.add_argument("--build-metrics", metavar="FONT_DIR",
+                        help="FONT_DIR의 Pretendard 파일에서 --metrics 표를 만들고 종료 (fontTools 필요)")
+    args = parser.parse_args(argv)
+
+    if args.build_metrics:
+        try:
+            metrics = build_metrics(args.build_metrics, args.metrics)
+        except ImportError:
+            print("fontTools 미설치: pip install fonttools brotli")
+            return 1
+        except FileNotFoundError as e:
+            print(e)
+            return 1
+        print(f"폭 표 저장: {args.metrics} (굵기 {sorted(metrics['weights'])})")
+        return 0
+
+    t0 = time.perf_counter()
+    ts = Typesetter(load_metrics(args.metrics))
+    autofit_min = args.autofit or AUTOFIT_MIN
+    report = []
+    for path in _expand(args.paths):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                slides = check_deck(json.load(f), ts, args.margin, autofit_min)
+            report.append({"deck": path, "slides": slides, "error": None})
+        except (OSError, ValueError, AttributeError, TypeError) as e:
+            report.append({"deck": path, "slides": [], "error": f"{type(e).__name__}: {e}"})
+    ms = (time.perf_counter() - t0) * 1000
+
+    failed = 0
+    for deck in report:
+        for s in deck["slides"]:
+            s["status"] = ("ok" if not s["overflow"] else
+                           "autofit" if args.autofit and s["fit_scale"] else "overflow")
+            failed += s["status"] == "overflow"
+        failed += bool(deck["error"])
+    if not report:
+        failed += 1  # 점검한 덱이 없으면 통과로 치지 않는다 (경로 오타·빈 glob)
+
+    if args.json:
+        print(json.dumps({"metrics": ts.metrics["source"], "approximate": _is_approx(ts.metrics),
+                          "ms": round(ms, 2), "failed": failed, "decks": report}, ensure_ascii=False, indent=2))
+        return 1 if failed else 0
+
+    source = ("내장 근사치 — Pretendard 실측 아님, --build-metrics FONT_DIR로 정밀 표 생성"
+              if _is_approx(ts.metrics) else f"Pretendard 실측 {ts.metrics['source']}")
+    print(f"점검 {len(report)}개 덱 · {sum(len(d['slides']) for d in report)}장 · {ms:.1f}ms (폭 표: {source})")
+    if not report:
+        print(f"\n대상 slides JSON 없음: {' '.join(args.paths)}")
+        return 1
+    for deck in report:
+        if deck["error"]:
+            print(f"\n{deck['deck']}  실패: {deck['error']}")
+            continue
+        rows = [s for s in deck["slides"] if args.all or s["status"] != "ok"]
+        if not rows:
+            continue
+        print(f"\n{deck['deck']}")
+        for s in rows:
+            note = ""
+            if s["overflow"]:
+                note = f"  {s['overflow']:.0f}px 넘침"
+                note += f" · 자동 맞춤 ×{s['fit_scale']:.2f}로 해결" if s["fit_scale"] else " · 자동 맞춤으로도 안 됨"
+            mark = {"ok": "  ", "autofit": "△ ", "overflow": "✗ "}[s["status"]]
+            print(f"  {mark}{s['name']:<28} 하단 {s['bottom']:>6.0f} / {s['limit']:.0f}{note}")
+    print(f"\n{'실패 ' + str(failed) + '건' if failed else '넘침 없음'}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,30 +1,5 @@
 # -*- coding: utf-8 -*-
-import re
-
-def count_chars(text):
-    """공백, 마크다운 태그, 이미지 주석, HTML 태그, 표 구분자 제외한 글자 수"""
-    # 이미지 주석 제거
-    text = re.sub(r'<!--.*?-->', '', text, flags=re.DOTALL)
-    # HTML 태그 제거
-    text = re.sub(r'<[^>]+>', '', text)
-    # 마크다운 헤딩 태그 제거
-    text = re.sub(r'^#{1,6}\s+', '', text, flags=re.MULTILINE)
-    # 마크다운 굵기/기울기 제거 (텍스트는 유지)
-    text = re.sub(r'\*{1,3}(.*?)\*{1,3}', r'\1', text)
-    # 마크다운 인용구 기호 제거
-    text = re.sub(r'^>\s*', '', text, flags=re.MULTILINE)
-    # 표 구분자 행 제거
-    text = re.sub(r'^\|[-|\s:]+\|$', '', text, flags=re.MULTILINE)
-    # 표 셀 구분자 제거
-    text = re.sub(r'\|', '', text)
-    # 수평선 제거
-    text = re.sub(r'^[-=]{3,}.*$', '', text, flags=re.MULTILINE)
-    text = re.sub(r'^[━]{3,}.*$', '', text, flags=re.MULTILINE)
-    # 마크다운 링크 처리
-    text = re.sub(r'\[([^\]]+)\]\([^\)]+\)', r'\1', text)
-    # 공백 제거
-    text = re.sub(r'\s', '', text)
-    return len(text)
+from blog_chars import count_chars
 
 
 # 서론
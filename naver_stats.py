@@ -0,0 +1,311 @@
+# -*- coding: utf-8 -*-
+"""
+네이버 블로그 통계 내보내기(.xlsx) → SQLite 캐시
+
+statics/ 의 조회수·유입분석·성연령별분포·재방문율·평균사용시간·조회수_순위 등 .xlsx를
+한 번만 파싱해 statics/_naver_stats.sqlite 에 넣고, 이후 분석·대시보드는 캐시에서 읽는다.
+  - 파싱은 표준 라이브러리(zipfile + ElementTree)만 사용 (openpyxl 불필요)
+  - mtime/size가 바뀐 파일만 다시 파싱, 사라진 파일은 캐시에서 제거
+  - 같은 (데이터명, 단위, 기간, 선택1, 선택2) 내보내기가 여러 번 있으면 다운로드 시각이
+    가장 늦은 것만 active (파일명이 비슷해도 선택1이 '전체'/'검색 유입', '게시물'/'주제'처럼
+    다르면 서로 다른 데이터로 둔다)
+
+  python naver_stats.py                          # 적재 + 데이터셋 요약
+  python naver_stats.py query 조회수 --unit 월간   # active 레코드 출력
+  python naver_stats.py export dashboard.json    # active 레코드 전체를 JSON으로
+  python naver_stats.py sql "SELECT ..."         # 캐시에 직접 질의
+"""
+
+import argparse
+import glob
+import io
+import json
+import os
+import re
+import sqlite3
+import sys
+import time
+import zipfile
+import xml.etree.ElementTree as ET
+
+STATICS_DIR = "statics"
+CACHE_NAME = "_naver_stats.sqlite"
+SCHEMA_VERSION = 1
+
+_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_CELL_REF_RE = re.compile(r"([A-Z]+)(\d+)")
+_STAMP_RE = re.compile(r"_(\d{8})_(\d{6})\.xlsx$")
+_DATE_RE = re.compile(r"(\d{4})[.-](\d{2})[.-](\d{2})")
+_NUMBER_RE = re.compile(r"^-?\d+(?:\.\d+)?$")
+
+
+# ──────────────────────────────────────────────
+# .xlsx 파싱 (표준 라이브러리)
+# ──────────────────────────────────────────────
+
+def _col_index(letters: str) -> int:
+    n = 0
+    for ch in letters:
+        n = n * 26 + ord(ch) - 64
+    return n - 1
+
+
+def read_xlsx(path: str) -> list:
+    """첫 시트 → 행 목록 (셀 참조 열 위치 유지, 빈 셀은 None)"""
+    with zipfile.ZipFile(path) as z:
+        names = set(z.namelist())
+        shared = []
+        if "xl/sharedStrings.xml" in names:
+            for si in ET.fromstring(z.read("xl/sharedStrings.xml")).iter(_NS + "si"):
+                shared.append("".join(t.text or "" for t in si.iter(_NS + "t")))
+        sheet = "xl/worksheets/sheet1.xml" if "xl/worksheets/sheet1.xml" in names else \
+            sorted(n for n in names if n.startswith("xl/worksheets/sheet"))[0]
+        root = ET.fromstring(z.read(sheet))
+
+    rows = []
+    for row in root.iter(_NS + "row"):
+        values = {}
+        for i, c in enumerate(row.iter(_NS + "c")):
+            m = _CELL_REF_RE.match(c.get("r", ""))
+            col = _col_index(m.group(1)) if m else i
+            kind = c.get("t")
+            if kind == "inlineStr":
+                value = "".join(t.text or "" for t in c.iter(_NS + "t"))
+            else:
+                v = c.find(_NS + "v")
+                value = None if v is None else shared[int(v.text)] if kind == "s" else v.text
+            values[col] = value
+        rows.append([values.get(i) for i in range(max(values) + 1)] if values else [])
+    return rows
+
+
+def _number(value):
+    if isinstance(value, str) and _NUMBER_RE.match(value):
+        return float(value) if "." in value else int(value)
+    return value
+
+
+def _period(text: str) -> tuple:
+    """'2025-04-01~2025-04-30' / '2025.04.01. 월간' / '2026-02-19' → (시작, 끝) ISO 날짜"""
+    dates = ["-".join(m) for m in _DATE_RE.findall(text or "")]
+    if not dates:
+        return None, None
+    return dates[0], dates[-1]
+
+
+def parse_export(path: str) -> dict:
+    """네이버 통계 내보내기 1개 → {"meta", "columns", "records"}
+
+    앞쪽 '항목, 값' 행(서비스명·데이터명·데이터 단위·데이터 기간·선택1/2·다운로드 날짜)은 meta,
+    빈 행 다음 첫 행은 열 이름, 나머지는 레코드 (모든 값이 비어 있는 행은 버림).
+    """
+    rows = read_xlsx(path)
+    meta = {}
+    i = 0
+    while i < len(rows) and any(v not in (None, "") for v in rows[i]):
+        if len(rows[i]) >= 2 and rows[i][0]:
+            meta[rows[i][0]] = rows[i][1]
+        i += 1
+    while i < len(rows) and not any(v not in (None, "") for v in rows[i]):
+        i += 1
+
+    columns = []
+    for name in rows[i] if i < len(rows) else []:
+        name = name or "값"
+        columns.append(name if name not in columns else f"{name}_{columns.count(name) + 1}")
+    records = []
+    for row in rows[i + 1:]:
+        record = {col: _number(v) for col, v in zip(columns, row) if v not in (None, "")}
+        if record:
+            records.append(record)
+    return {"meta": meta, "columns": columns, "records": records}
+
+
+def _downloaded(path: str, meta: dict) -> str:
+    """다운로드 시각 (파일명 _YYYYMMDD_HHMMSS 우선, 없으면 meta)"""
+    m = _STAMP_RE.search(path)
+    if m:
+        d, t = m.groups()
+        return f"{d[:4]}-{d[4:6]}-{d[6:]}T{t[:2]}:{t[2:4]}:{t[4:]}"
+    nums = re.findall(r"\d+", meta.get("다운로드 날짜", ""))
+    return "{}-{}-{}T{}:{}:{}".format(*nums[:6]) if len(nums) >= 6 else ""
+
+
+# ──────────────────────────────────────────────
+# SQLite 캐시
+# ──────────────────────────────────────────────
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY, mtime INTEGER, size INTEGER,
+    dataset TEXT, unit TEXT, selection TEXT, period_start TEXT, period_end TEXT,
+    downloaded TEXT, columns TEXT, records INTEGER, active INTEGER DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS records (
+    path TEXT, row_no INTEGER, dataset TEXT, unit TEXT, selection TEXT,
+    period_start TEXT, period_end TEXT, data TEXT,
+    PRIMARY KEY (path, row_no)
+);
+CREATE INDEX IF NOT EXISTS records_dataset ON records (dataset, unit, selection, period_start);
+CREATE VIEW IF NOT EXISTS active_records AS
+    SELECT r.* FROM records r JOIN files f ON f.path = r.path WHERE f.active = 1;
+"""
+
+
+class StatsCache:
+    """statics/*.xlsx ↔ _naver_stats.sqlite 동기화 + 질의"""
+
+    def __init__(self, statics_dir: str = STATICS_DIR, db_path: str = None):
+        self.statics_dir = statics_dir
+        self.db_path = db_path or os.path.join(statics_dir, CACHE_NAME)
+        self.db = sqlite3.connect(self.db_path)
+        self.db.row_factory = sqlite3.Row
+        if self.db.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            self.db.executescript("DROP VIEW IF EXISTS active_records; DROP TABLE IF EXISTS records;"
+                                  "DROP TABLE IF EXISTS files;")
+            self.db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self.db.executescript(_SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def sync(self) -> dict:
+        """새로 생기거나 바뀐 .xlsx만 파싱, 사라진 파일 제거, 중복 내보내기 중 최신만 active"""
+        t0 = time.perf_counter()
+        on_disk = {}
+        for path in glob.glob(os.path.join(self.statics_dir, "*.xlsx")):
+            st = os.stat(path)
+            on_disk[os.path.basename(path)] = (st.st_mtime_ns, st.st_size)
+        known = {r["path"]: (r["mtime"], r["size"]) for r in self.db.execute("SELECT path, mtime, size FROM files")}
+
+        removed = [p for p in known if p not in on_disk]
+        parsed, failed = [], []
+        with self.db:
+            for name in removed:
+                self.db.execute("DELETE FROM records WHERE path = ?", (name,))
+                self.db.execute("DELETE FROM files WHERE path = ?", (name,))
+            for name, stat in sorted(on_disk.items()):
+                if known.get(name) == stat:
+                    continue
+                try:
+                    export = parse_export(os.path.join(self.statics_dir, name))
+                except (OSError, KeyError, IndexError, ValueError, TypeError,
+                        zipfile.BadZipFile, ET.ParseError) as e:
+                    failed.append((name, f"{type(e).__name__}: {e}"))
+                    continue
+                self._store(name, stat, export)
+                parsed.append(name)
+            if parsed or removed:
+                self._mark_active()
+        return {"parsed": parsed, "removed": removed, "failed": failed,
+                "seconds": round(time.perf_counter() - t0, 4)}
+
+    def _store(self, name: str, stat: tuple, export: dict):
+        meta = export["meta"]
+        dataset = meta.get("데이터명") or name.split("_월간")[0].split("_일간")[0]
+        unit = meta.get("데이터 단위", "")
+        selection = " / ".join(meta[k] for k in ("선택1", "선택2") if meta.get(k))
+        # 파일 기간: 파일명의 시작~끝 (meta '2025.04.01. 월간'에는 끝 날짜가 없음)
+        start, end = _period(name.rsplit("_", 2)[0])
+        self.db.execute("DELETE FROM records WHERE path = ?", (name,))
+        self.db.execute(
+            "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0)",
+            (name, stat[0], stat[1], dataset, unit, selection, start, end, _downloaded(name, meta),
+             json.dumps(export["columns"], ensure_ascii=False), len(export["records"])))
+        rows = []
+        for i, record in enumerate(export["records"]):
+            # 행마다 기간('기간'/'날짜' 열)이 있으면 그 기간, 없으면 파일 기간
+            row_start, row_end = _period(str(record.get("기간") or record.get("날짜") or ""))
+            rows.append((name, i, dataset, unit, selection, row_start or start, row_end or end,
+                         json.dumps(record, ensure_ascii=False)))
+        self.db.executemany("INSERT INTO records VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+    def _mark_active(self):
+        """(데이터명, 단위, 선택, 기간)마다 다운로드 시각이 가장 늦은 파일만 active"""
+        self.db.execute("UPDATE files SET active = 0")
+        self.db.execute("""
+            UPDATE files SET active = 1 WHERE path IN (
+                SELECT path FROM (
+                    SELECT path, ROW_NUMBER() OVER (
+                        PARTITION BY dataset, unit, selection, period_start, period_end
+                        ORDER BY downloaded DESC, path DESC) AS rn
+                    FROM files)
+                WHERE rn = 1)""")
+
+    def summary(self) -> list:
+        return [dict(r) for r in self.db.execute("""
+            SELECT dataset, unit, COUNT(*) AS files, SUM(active) AS active,
+                   SUM(CASE WHEN active = 1 THEN records ELSE 0 END) AS records,
+                   MIN(period_start) AS first, MAX(period_end) AS last
+            FROM files GROUP BY dataset, unit ORDER BY dataset, unit""")]
+
+    def query(self, dataset: str = None, unit: str = None, selection: str = None,
+              start: str = None, end: str = None) -> list:
+        """active 레코드 → [{"dataset", "unit", "selection", "period_start", "period_end", ...열}]"""
+        sql = "SELECT dataset, unit, selection, period_start, period_end, data FROM active_records WHERE 1=1"
+        params = []
+        for column, op, value in (("dataset", "=", dataset), ("unit", "=", unit), ("selection", "=", selection),
+                                  ("period_start", ">=", start), ("period_end", "<=", end)):
+            if value:
+                sql += f" AND {column} {op} ?"
+                params.append(value)
+        sql += " ORDER BY dataset, unit, selection, period_start, path, row_no"
+        return [{**{k: r[k] for k in r.keys() if k != "data"}, **json.loads(r["data"])}
+                for r in self.db.execute(sql, params)]
+
+
+def main(argv=None) -> int:
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+
+    parser = argparse.ArgumentParser(description="네이버 블로그 통계 .xlsx → SQLite 캐시")
+    parser.add_argument("--dir", default=STATICS_DIR, help=f"내보내기 폴더 (기본 {STATICS_DIR})")
+    parser.add_argument("--db", default=None, help=f"캐시 파일 (기본 <dir>/{CACHE_NAME})")
+    sub = parser.add_subparsers(dest="command")
+    q = sub.add_parser("query", help="active 레코드 출력")
+    q.add_argument("dataset", nargs="?")
+    q.add_argument("--unit")
+    q.add_argument("--selection")
+    q.add_argument("--start", help="기간 시작 하한 (YYYY-MM-DD)")
+    q.add_argument("--end", help="기간 끝 상한 (YYYY-MM-DD)")
+    q.add_argument("--json", action="store_true")
+    e = sub.add_parser("export", help="active 레코드 전체를 JSON 파일로 (대시보드용)")
+    e.add_argument("out")
+    s = sub.add_parser("sql", help="캐시에 SQL 직접 실행")
+    s.add_argument("statement")
+    args = parser.parse_args(argv)
+
+    cache = StatsCache(args.dir, args.db)
+    try:
+        stats = cache.sync()
+        print(f"캐시 {cache.db_path} · 파싱 {len(stats['parsed'])} · 제거 {len(stats['removed'])}"
+              f" · {stats['seconds'] * 1000:.0f}ms")
+        for name, error in stats["failed"]:
+            print(f"  실패 {name}: {error}")
+
+        if args.command == "query":
+            rows = cache.query(args.dataset, args.unit, args.selection, args.start, args.end)
+            if args.json:
+                print(json.dumps(rows, ensure_ascii=False, indent=2))
+            else:
+                for r in rows:
+                    print("  " + " | ".join(f"{v}" for v in r.values()))
+                print(f"{len(rows)}건")
+        elif args.command == "export":
+            rows = cache.query()
+            with open(args.out, "w", encoding="utf-8") as f:
+                json.dump(rows, f, ensure_ascii=False, indent=2)
+            print(f"{len(rows)}건 → {args.out}")
+        elif args.command == "sql":
+            for r in cache.db.execute(args.statement):
+                print("  " + " | ".join(f"{v}" for v in tuple(r)))
+        else:
+            for r in cache.summary():
+                print(f"  {r['dataset']:<10} {r['unit']:<3} 파일 {r['files']:>2} (active {r['active']:>2})"
+                      f" · 레코드 {r['records']:>4} · {r['first']} ~ {r['last']}")
+        return 1 if stats["failed"] else 0
+    finally:
+        cache.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
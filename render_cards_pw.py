@@ -2,14 +2,32 @@
 """
 카드뉴스 렌더링: HTML 생성 → Playwright 스크린샷 (WeasyPrint 대체)
 Windows 환경에서 GTK 없이 동작
+
+스크린샷은 같은 프로세스에서 Playwright(Python)로 직접 찍는다.
+  pip install playwright && playwright install chromium
 """
 
+import argparse
+import asyncio
 import base64
+import csv
+import functools
+import glob
+import hashlib
+import io
+import itertools
 import json
 import os
+import re
 import subprocess
 import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from html import escape, unescape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
 
 
 # ──────────────────────────────────────────────
@@ -91,6 +109,254 @@ def _resolve_image(path_or_name: str, assets_dir: str = "") -> str:
     return ""
 
 
+# 이미지가 카드에서 차지하는 최대 표시 크기 (CSS px, None은 제약 없음)
+#   cover/cta: 프로필 컷아웃 폭 (.cover-profile 520px / .cta-profile-cutout 540px), logo: .logo-img 높이 44px
+IMAGE_BOXES = {"cover": (520, None), "cta": (540, None), "logo": (None, 44)}
+
+
+class ImageCache:
+    """이미지 에셋 디스크 캐시: 원본 해시 × 표시 크기별로 축소·인코딩한 결과를 저장
+
+    <cache_dir>/.gitignore         "*" — 캐시 폴더를 어디에 두든 git에 섞이지 않게 (pytest 캐시와 같은 방식)
+    <cache_dir>/_index.json        원본 경로 → (mtime, size, sha256)  … 바뀌지 않은 원본은 다시 읽지 않음
+    <cache_dir>/{sha}_{w}x{h}.png  표시 크기(× scale)에 맞춰 줄인 변형 (JPEG 원본은 .jpg)
+    <cache_dir>/{sha}_{w}x{h}.b64  그 변형의 data URI (inline 모드가 그대로 읽어 씀)
+    <cache_dir>/{sha}.b64          줄일 필요가 없거나 Pillow가 없어 원본을 그대로 쓸 때의 data URI
+
+    961×1440 프로필을 520px 칸에 넣으면 Chromium이 슬라이드마다 원본을 디코드·축소하는데,
+    캐시된 변형을 쓰면 HTML도 가벼워지고 디코드도 표시 크기만큼만 한다.
+    Pillow가 없으면 축소는 건너뛰고(원본 그대로) 해시·인코딩만 캐시한다.
+    """
+
+    INDEX_NAME = "_index.json"
+
+    def __init__(self, cache_dir: str, scale: float = 1.0):
+        self.cache_dir = os.path.abspath(cache_dir)
+        self.scale = scale
+        os.makedirs(self.cache_dir, exist_ok=True)
+        ignore_path = os.path.join(self.cache_dir, ".gitignore")
+        if not os.path.exists(ignore_path):
+            _write_bytes(ignore_path, b"*\n")
+        self._index_path = os.path.join(self.cache_dir, self.INDEX_NAME)
+        try:
+            with open(self._index_path, "r", encoding="utf-8") as f:
+                self._index = json.load(f)
+        except (OSError, ValueError):
+            self._index = {}
+        self._lock = threading.Lock()
+
+    def _digest(self, path: str) -> str:
+        st = os.stat(path)
+        entry = self._index.get(path)
+        if entry and entry["mtime"] == st.st_mtime_ns and entry["size"] == st.st_size:
+            return entry["sha"]
+        with open(path, "rb") as f:
+            sha = hashlib.sha256(f.read()).hexdigest()[:16]
+        with self._lock:
+            self._index[path] = {"mtime": st.st_mtime_ns, "size": st.st_size, "sha": sha}
+            tmp = self._index_path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self._index, f, ensure_ascii=False, indent=2)
+            os.replace(tmp, self._index_path)
+        return sha
+
+    def variant(self, path: str, box: tuple) -> str:
+        """box(CSS px) × scale에 맞춘 변형 파일 경로. 이미 있으면 원본을 열지 않는다"""
+        sha = self._digest(path)
+        bw, bh = (int(-(-v * self.scale // 1)) if v else 0 for v in box)
+        ext = ".jpg" if path.lower().endswith((".jpg", ".jpeg")) else ".png"
+        out = os.path.join(self.cache_dir, f"{sha}_{bw}x{bh}{ext}")
+        if os.path.exists(out):
+            return out
+        try:
+            from PIL import Image
+        except ImportError:
+            return path
+        with Image.open(path) as im:
+            ratio = min(bw / im.width if bw else 1.0, bh / im.height if bh else 1.0)
+            if ratio >= 1.0:
+                return path  # 이미 표시 크기 이하 → 원본 그대로
+            resized = im.resize((max(1, round(im.width * ratio)), max(1, round(im.height * ratio))),
+                                Image.Resampling.LANCZOS)
+            tmp = out + ".tmp"
+            if ext == ".jpg":
+                resized.convert("RGB").save(tmp, "JPEG", quality=92)
+            else:
+                resized.save(tmp, "PNG", optimize=True)
+        os.replace(tmp, out)
+        return out
+
+    def data_uri(self, variant_path: str) -> str:
+        """변형(또는 원본)의 data URI. 캐시 안 변형은 옆의 .b64, 원본은 <cache_dir>/{sha}.b64 에 저장"""
+        if os.path.dirname(os.path.abspath(variant_path)) == self.cache_dir:
+            uri_path = os.path.splitext(variant_path)[0] + ".b64"
+        else:
+            uri_path = os.path.join(self.cache_dir, f"{self._digest(variant_path)}.b64")
+        if os.path.exists(uri_path):
+            with open(uri_path, "r", encoding="ascii") as f:
+                return f.read()
+        uri = _img_to_base64(variant_path)
+        _write_bytes(uri_path, uri.encode("ascii"))
+        return uri
+
+
+ASSET_MODES = ("inline", "link")
+
+
+class AssetRegistry:
+    """배치 단위 이미지 레지스트리: 같은 파일은 한 번만 읽고 src 문자열을 재사용
+
+    inline : data URI (기존 방식, HTML 파일 하나로 완결)
+    link   : file:// URI → 슬라이드 HTML이 수백 KB 가벼워지고,
+             Chromium은 같은 컨텍스트 안에서 이미지를 한 번만 받아 디코드
+    link 모드 URI에는 파일 내용 해시(?v=)를 붙여 렌더 캐시 키가 이미지 변경을 따라가게 한다.
+    cache(ImageCache)를 주면 box가 지정된 이미지는 표시 크기로 줄인 캐시 변형을 쓴다.
+    """
+
+    def __init__(self, mode: str = "inline", cache: ImageCache = None):
+        self.mode = mode
+        self.cache = cache
+        self.seconds = 0.0  # 파일 읽기·인코딩에 쓴 누적 시간 (리포트용)
+        self._resolved = {}
+        self._src = {}
+
+    def src(self, path_or_name: str, assets_dir: str = "", box: tuple = None) -> str:
+        if (path_or_name, assets_dir) not in self._resolved:
+            self._resolved[path_or_name, assets_dir] = _resolve_image(path_or_name, assets_dir)
+        resolved = self._resolved[path_or_name, assets_dir]
+        if not resolved:
+            return ""
+        key = os.path.abspath(resolved)
+        box = box if self.cache else None
+        if (key, box) not in self._src:
+            t0 = time.perf_counter()
+            path = self.cache.variant(key, box) if box else key
+            if self.mode == "link":
+                if box and path != key:
+                    digest = Path(path).stem.split("_", 1)[0][:12]  # 변형 파일명 = 원본 해시
+                else:
+                    with open(path, "rb") as f:
+                        digest = hashlib.sha256(f.read()).hexdigest()[:12]
+                self._src[key, box] = f"{Path(path).as_uri()}?v={digest}"
+            else:
+                self._src[key, box] = self.cache.data_uri(path) if box else _img_to_base64(path)
+            self.seconds += time.perf_counter() - t0
+        return self._src[key, box]
+
+
+def _asset_registry(args) -> AssetRegistry:
+    """CLI 옵션(--assets / --image-cache) → AssetRegistry. 변형은 --sizes 중 가장 큰 배율에 맞춰 줄인다"""
+    cache = (ImageCache(args.image_cache, _asset_scale(getattr(args, "sizes", None)))
+             if getattr(args, "image_cache", None) else None)
+    return AssetRegistry(args.assets, cache)
+
+
+# ──────────────────────────────────────────────
+# 폰트 (Pretendard)
+# ──────────────────────────────────────────────
+
+PRETENDARD_CDN = "https://cdn.jsdelivr.net/gh/orioncactus/pretendard@v1.3.9/dist/web/static/pretendard.min.css"
+FONT_MODES = ("cdn", "local", "embed")
+
+# CSS에서 쓰는 굵기 → Pretendard static 파일명 (Pretendard-{name}.woff2 등)
+PRETENDARD_WEIGHTS = {
+    400: "Regular",
+    600: "SemiBold",
+    700: "Bold",
+    800: "ExtraBold",
+    900: "Black",
+}
+FONT_FORMATS = {".woff2": "woff2", ".woff": "woff", ".otf": "opentype", ".ttf": "truetype"}
+
+# 슬라이드 템플릿에 박혀 있는 글자 (서브셋에서 빠지면 안 됨) — 페이지 표시 "3 / 8"·자동 번호의 숫자 포함
+_TEMPLATE_GLYPHS = "\u25C6\u2713\u2192\u260E POINT 스와이프해서 확인하세요 0123456789/.·"
+_MARKUP_RE = re.compile(r"<(style|script)\b.*?</\1>|<[^>]+>", re.S)
+
+
+def _find_font_file(font_dir: str, name: str) -> str:
+    for ext in FONT_FORMATS:
+        candidate = os.path.join(font_dir, f"Pretendard-{name}{ext}")
+        if os.path.exists(candidate):
+            return candidate
+    return ""
+
+
+def _font_face(weight: int, src: str, fmt: str) -> str:
+    return (f"@font-face {{ font-family: 'Pretendard'; font-style: normal; font-weight: {weight};"
+            f" font-display: block; src: url('{src}') format('{fmt}'); }}")
+
+
+def _subset_font(font_path: str, text: str):
+    """font_path를 text에 쓰인 글자만 남기고 자름 → (bytes, format)"""
+    from fontTools import subset
+
+    options = subset.Options()
+    options.layout_features = ["*"]
+    try:
+        import brotli  # noqa: F401  (woff2 압축)
+        options.flavor = "woff2"
+    except ImportError:
+        options.flavor = None
+    font = subset.load_font(font_path, options)
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(text=text)
+    subsetter.subset(font)
+    buf = io.BytesIO()
+    subset.save_font(font, buf, options)
+    if options.flavor:
+        fmt = "woff2"
+    else:
+        fmt = "opentype" if "CFF " in font else "truetype"
+    return buf.getvalue(), fmt
+
+
+def _font_css(mode: str = "cdn", font_dir: str = "", text: str = "", out_dir: str = "") -> str:
+    """Pretendard 로딩 CSS
+
+    cdn   : jsDelivr @import (기존 방식, 네트워크 필요)
+    local : font_dir의 파일을 file:// 로 참조 → 같은 브라우저 컨텍스트에서 한 번만 로드
+    embed : 덱에 쓰인 글자(text)만 서브셋 (fontTools 필요).
+            out_dir을 주면 out_dir/_fonts 에 한 번 써두고 상대경로로 참조, 없으면 data URI
+    로컬 파일을 못 찾으면 cdn으로 되돌린다.
+    """
+    if mode == "cdn" or not font_dir:
+        return f"@import url('{PRETENDARD_CDN}');"
+    if mode == "embed":
+        try:
+            import fontTools  # noqa: F401
+        except ImportError:
+            print("  [font] fontTools 미설치(pip install fonttools): 서브셋 없이 local 모드로 대체")
+            mode = "local"
+
+    faces = []
+    for weight, name in PRETENDARD_WEIGHTS.items():
+        font_path = _find_font_file(font_dir, name)
+        if not font_path:
+            continue
+        if mode == "local":
+            fmt = FONT_FORMATS[os.path.splitext(font_path)[1].lower()]
+            faces.append(_font_face(weight, Path(font_path).resolve().as_uri(), fmt))
+            continue
+        payload, fmt = _subset_font(font_path, text + _TEMPLATE_GLYPHS)
+        ext = {"woff2": ".woff2", "opentype": ".otf", "truetype": ".ttf"}[fmt]
+        if out_dir:
+            fonts_dir = os.path.join(out_dir, "_fonts")
+            os.makedirs(fonts_dir, exist_ok=True)
+            filename = f"Pretendard-{name}.subset{ext}"
+            with open(os.path.join(fonts_dir, filename), "wb") as f:
+                f.write(payload)
+            src = f"_fonts/{filename}"
+        else:
+            mime = "font/woff2" if fmt == "woff2" else f"font/{ext.lstrip('.')}"
+            src = f"data:{mime};base64,{base64.b64encode(payload).decode('ascii')}"
+        faces.append(_font_face(weight, src, fmt))
+
+    if not faces:
+        print(f"  [font] {font_dir} 에 Pretendard 파일이 없어 CDN으로 대체")
+        return f"@import url('{PRETENDARD_CDN}');"
+    return "\n    ".join(faces)
+
+
 def _is_dark_theme(theme: dict) -> bool:
     bg = theme.get("bg", "")
     for s in ["#f8", "#ff", "#fe", "#e9"]:
@@ -103,6 +369,16 @@ def _nl(text: str) -> str:
     return text.replace("\\n", "<br>").replace("\n", "<br>")
 
 
+def _esc(value) -> str:
+    """슬라이드 텍스트 이스케이프 (&, <, > — 속성값에는 쓰지 않으므로 따옴표는 그대로)"""
+    return escape(str(value), quote=False)
+
+
+def _text(value) -> str:
+    """이스케이프 + 줄바꿈(<br>). 슬라이드 본문 필드용"""
+    return _nl(_esc(value))
+
+
 def _dot_indicator(current: int, total: int) -> str:
     """우하단 도트 페이지 인디케이터 HTML"""
     if total <= 0:
@@ -126,8 +402,8 @@ def _logo_html(data: dict, theme: dict) -> str:
 
 def _footer_html(data: dict, theme: dict) -> str:
     """브랜드 푸터 (방패 아이콘 포함)"""
-    name = data.get('footer_name', '')
-    handle = data.get('footer_handle', '')
+    name = _esc(data.get('footer_name', ''))
+    handle = _esc(data.get('footer_handle', ''))
     return f"""<div class="footer"><div class="footer-flex">
         <div class="footer-brand"><span class="footer-shield"></span><span>{name}</span></div>
         <span>{handle}</span>
@@ -138,7 +414,35 @@ def _footer_html(data: dict, theme: dict) -> str:
 # 공통 CSS
 # ──────────────────────────────────────────────
 
-def _base_css(theme: dict, current_page: int = 0, total_pages: int = 0) -> str:
+CSS_MODES = ("inline", "link")
+
+
+def _base_css(theme: dict, current_page: int = 0, total_pages: int = 0, font_css: str = None) -> str:
+    """공통 CSS. 테마·도트 유무·폰트 CSS가 같으면 한 번 만든 문자열을 재사용
+
+    font_css가 None이면 Pretendard CDN @import
+    """
+    return _compiled_base_css(tuple(sorted(theme.items())), total_pages > 0, font_css)
+
+
+def _css_link(data: dict) -> str:
+    """--css link: 덱 공용 스타일시트 <link>"""
+    href = data.get("_css_href")
+    return f'<link rel="stylesheet" href="{href}">' if href else ""
+
+
+def _shared_css(data: dict, theme: dict) -> str:
+    """슬라이드 <style> 맨 앞에 들어갈 공통 CSS (공용 스타일시트를 쓰면 비움)"""
+    if data.get("_css_href"):
+        return ""
+    return _base_css(theme, data.get("_page_cur", 0), data.get("_page_total", 0), data.get("_font_css"))
+
+
+@functools.lru_cache(maxsize=64)
+def _compiled_base_css(theme_items: tuple, with_dots: bool, font_css: str = None) -> str:
+    theme = dict(theme_items)
+    if font_css is None:
+        font_css = f"@import url('{PRETENDARD_CDN}');"
     accent = theme['accent']
     accent_sub = theme.get('accent_sub', accent)
     glass_bg = theme.get('glass_bg', 'rgba(255,255,255,0.06)')
@@ -147,7 +451,7 @@ def _base_css(theme: dict, current_page: int = 0, total_pages: int = 0) -> str:
 
     # 도트 인디케이터 HTML용 CSS
     dots_css = ""
-    if total_pages > 0:
+    if with_dots:
         dots_css = f"""
     .dot-indicator {{
         position: absolute; bottom: 78px; right: 80px;
@@ -165,7 +469,7 @@ def _base_css(theme: dict, current_page: int = 0, total_pages: int = 0) -> str:
     }}"""
 
     return f"""
-    @import url('https://cdn.jsdelivr.net/gh/orioncactus/pretendard@v1.3.9/dist/web/static/pretendard.min.css');
+    {font_css}
     * {{ margin: 0; padding: 0; box-sizing: border-box; }}
     html {{
         width: 1080px; height: 1080px;
@@ -285,40 +589,76 @@ def _base_css(theme: dict, current_page: int = 0, total_pages: int = 0) -> str:
 
 
 # ──────────────────────────────────────────────
-# 슬라이드 HTML 생성
+# 슬라이드 타입 레지스트리
 # ──────────────────────────────────────────────
 
-def slide_cover(data, theme, page_info):
-    badge = data.get("badge", "")
-    title = _nl(data.get("title", ""))
-    subtitle = _nl(data.get("subtitle", ""))
-    highlight = data.get("highlight", "")
-    accent = theme['accent']
-    accent_sub = theme.get('accent_sub', accent)
-    cur, total = data.get("_page_cur", 0), data.get("_page_total", 0)
+# 타입 이름 → renderer(data, theme, page_info) → 슬라이드 HTML 전체
+RENDERERS = {}
 
-    # 하이라이트: 골드 언더라인 스타일
-    if highlight and highlight in title:
-        title = title.replace(highlight, f'<span class="gold-underline">{highlight}</span>')
 
-    profile_b64 = data.get("_profile_b64", "")
+def _page(data: dict, theme: dict, page_info: str, css: str, body: str) -> str:
+    """슬라이드 HTML 골격: 공통 CSS + 타입 CSS + 로고·페이지 번호 + 본문 + 도트"""
+    return f"""<!DOCTYPE html><html><head><meta charset="utf-8">{_css_link(data)}<style>
+    {_shared_css(data, theme)}
+{css}    </style></head><body>
+    {_logo_html(data, theme)}
+    <div class="page-num">{page_info}</div>
+{body}    {_dot_indicator(data.get("_page_cur", 0), data.get("_page_total", 0))}
+    </body></html>"""
 
-    profile_html = ""
-    if profile_b64:
-        profile_html = f"""
-        <div class="cover-profile">
-            <img src="{profile_b64}" />
-        </div>
-        <div class="cover-profile-info">
-            <div class="glass-chip cp-chip">
-                <div class="cp-name">{data.get('profile_name', '')}</div>
-                <div class="cp-title">{data.get('profile_title', '')}</div>
-            </div>
-        </div>"""
 
-    return f"""<!DOCTYPE html><html><head><meta charset="utf-8"><style>
-    {_base_css(theme, cur, total)}
-    /* 방패 워터마크 */
+def register_slide(name: str, css=None):
+    """슬라이드 타입 등록 데코레이터 (load_plugins로 불러온 모듈도 이걸로 새 타입을 추가)
+
+    body(data, theme) → <body> 안 본문 마크업 (사용자 텍스트는 _esc/_text로 이스케이프)
+    css(theme) → 타입 전용 CSS. 테마마다 한 번만 만들어 슬라이드·덱 사이에 재사용
+    데코레이터는 RENDERERS와 같은 renderer(data, theme, page_info)를 돌려준다.
+    """
+    compiled_css = functools.lru_cache(maxsize=64)(lambda theme_items: css(dict(theme_items))) if css else None
+
+    def decorator(body):
+        @functools.wraps(body)
+        def renderer(data, theme, page_info):
+            type_css = compiled_css(tuple(sorted(theme.items()))) if compiled_css else ""
+            return _page(data, theme, page_info, type_css, body(data, theme))
+
+        RENDERERS[name] = renderer
+        return renderer
+
+    return decorator
+
+
+def load_plugins(specs) -> list:
+    """플러그인 모듈(이름 또는 .py 경로)을 import → 새로 등록된 슬라이드 타입 목록
+
+    모듈은 import될 때 register_slide로 타입을 등록한다. 이미 있는 타입 이름이면 덮어쓴다.
+    """
+    import importlib
+    import importlib.util
+
+    # 스크립트(__main__)로 실행돼도 플러그인의 `import render_cards_pw`가 같은 RENDERERS를 보게
+    sys.modules.setdefault("render_cards_pw", sys.modules[__name__])
+    before = set(RENDERERS)
+    for spec in specs or ():
+        if spec.endswith(".py"):
+            name = f"_card_plugin_{Path(spec).stem}"
+            module_spec = importlib.util.spec_from_file_location(name, spec)
+            module = importlib.util.module_from_spec(module_spec)
+            sys.modules[name] = module
+            module_spec.loader.exec_module(module)
+        else:
+            importlib.import_module(spec)
+    return sorted(set(RENDERERS) - before)
+
+
+# ──────────────────────────────────────────────
+# 슬라이드 HTML 생성
+# ──────────────────────────────────────────────
+
+def _cover_css(theme):
+    accent = theme['accent']
+    accent_sub = theme.get('accent_sub', accent)
+    return f"""    /* 방패 워터마크 */
     body::after {{
         content: '';
         position: absolute;
@@ -372,10 +712,36 @@ def slide_cover(data, theme, page_info):
         color: {theme['t2']};
         margin-top: 4px;
     }}
-    </style></head><body>
-    {_logo_html(data, theme)}
-    <div class="page-num">{page_info}</div>
-    {profile_html}
+"""
+
+
+@register_slide("cover", css=_cover_css)
+def slide_cover(data, theme):
+    badge = _esc(data.get("badge", ""))
+    title = _text(data.get("title", ""))
+    subtitle = _text(data.get("subtitle", ""))
+    highlight = _esc(data.get("highlight", ""))
+
+    # 하이라이트: 골드 언더라인 스타일
+    if highlight and highlight in title:
+        title = title.replace(highlight, f'<span class="gold-underline">{highlight}</span>')
+
+    profile_b64 = data.get("_profile_b64", "")
+
+    profile_html = ""
+    if profile_b64:
+        profile_html = f"""
+        <div class="cover-profile">
+            <img src="{profile_b64}" />
+        </div>
+        <div class="cover-profile-info">
+            <div class="glass-chip cp-chip">
+                <div class="cp-name">{_esc(data.get('profile_name', ''))}</div>
+                <div class="cp-title">{_esc(data.get('profile_title', ''))}</div>
+            </div>
+        </div>"""
+
+    return f"""    {profile_html}
     <div class="content">
         <div class="top-line"></div>
         <div class="badge">{badge}</div>
@@ -383,26 +749,12 @@ def slide_cover(data, theme, page_info):
         <p class="sub">{subtitle}</p>
     </div>
     {_footer_html(data, theme)}
-    {_dot_indicator(cur, total)}
-    </body></html>"""
+"""
 
 
-def slide_problem(data, theme, page_info):
-    emoji = data.get("emoji", "")
-    main_text = _nl(data.get("main_text", ""))
-    sub_text = _nl(data.get("sub_text", ""))
+def _problem_css(theme):
     accent = theme['accent']
-    accent_sub = theme.get('accent_sub', accent)
-    cur, total = data.get("_page_cur", 0), data.get("_page_total", 0)
-
-    # 핵심 키워드 골드 하이라이트
-    highlight = data.get("highlight", "")
-    if highlight and highlight in main_text:
-        main_text = main_text.replace(highlight, f'<span class="gold-marker">{highlight}</span>')
-
-    return f"""<!DOCTYPE html><html><head><meta charset="utf-8"><style>
-    {_base_css(theme, cur, total)}
-    .content {{ margin-top: 200px; text-align: center; }}
+    return f"""    .content {{ margin-top: 200px; text-align: center; }}
     .emoji-container {{
         display: inline-flex;
         align-items: center;
@@ -446,38 +798,35 @@ def slide_problem(data, theme, page_info):
         padding: 3px;
         transform: rotate(-45deg);
     }}
-    </style></head><body>
-    {_logo_html(data, theme)}
-    <div class="page-num">{page_info}</div>
-    <div class="content">
+"""
+
+
+@register_slide("problem", css=_problem_css)
+def slide_problem(data, theme):
+    emoji = _esc(data.get("emoji", ""))
+    main_text = _text(data.get("main_text", ""))
+    sub_text = _text(data.get("sub_text", ""))
+
+    # 핵심 키워드 골드 하이라이트
+    highlight = _esc(data.get("highlight", ""))
+    if highlight and highlight in main_text:
+        main_text = main_text.replace(highlight, f'<span class="gold-marker">{highlight}</span>')
+
+    return f"""    <div class="content">
         <div class="emoji-container"><span class="emoji">{emoji}</span></div>
         <h2>{main_text}</h2>
         <p class="sub">{sub_text}</p>
     </div>
     <div class="swipe-hint">
-        <span>\u2192 \uc2a4\uc640\uc774\ud504\ud574\uc11c \ud655\uc778\ud558\uc138\uc694</span>
+        <span>→ 스와이프해서 확인하세요</span>
     </div>
     {_footer_html(data, theme)}
-    {_dot_indicator(cur, total)}
-    </body></html>"""
+"""
 
 
-def slide_point(data, theme, page_info):
-    number = data.get("number", "01")
-    heading = _nl(data.get("heading", ""))
-    body = _nl(data.get("body", ""))
-    highlight = data.get("highlight", "")
+def _point_css(theme):
     accent = theme['accent']
-    accent_sub = theme.get('accent_sub', accent)
-    cur, total = data.get("_page_cur", 0), data.get("_page_total", 0)
-
-    # 하이라이트: 골드 마커
-    if highlight and highlight in heading:
-        heading = heading.replace(highlight, f'<span class="gold-marker">{highlight}</span>')
-
-    return f"""<!DOCTYPE html><html><head><meta charset="utf-8"><style>
-    {_base_css(theme, cur, total)}
-    .content {{ margin-top: 180px; position: relative; }}
+    return f"""    .content {{ margin-top: 180px; position: relative; }}
     .num-watermark {{
         color: {theme.get('num_color', 'rgba(212,175,55,0.08)')};
         font-size: 180px; font-weight: 900;
@@ -516,10 +865,21 @@ def slide_point(data, theme, page_info):
         border-left: 4px solid {accent};
     }}
     .body {{ font-size: 28px; line-height: 1.75; color: {theme['t2']}; letter-spacing: 0.3px; }}
-    </style></head><body>
-    {_logo_html(data, theme)}
-    <div class="page-num">{page_info}</div>
-    <div class="content">
+"""
+
+
+@register_slide("point", css=_point_css)
+def slide_point(data, theme):
+    number = _esc(data.get("number", "01"))
+    heading = _text(data.get("heading", ""))
+    body = _text(data.get("body", ""))
+    highlight = _esc(data.get("highlight", ""))
+
+    # 하이라이트: 골드 마커
+    if highlight and highlight in heading:
+        heading = heading.replace(highlight, f'<span class="gold-marker">{highlight}</span>')
+
+    return f"""    <div class="content">
         <div class="num-watermark">{number}</div>
         <div class="point-header">
             <div class="point-number">{number}</div>
@@ -532,36 +892,14 @@ def slide_point(data, theme, page_info):
         </div>
     </div>
     {_footer_html(data, theme)}
-    {_dot_indicator(cur, total)}
-    </body></html>"""
+"""
 
 
-def slide_comparison(data, theme, page_info):
-    left_label = data.get("left_label", "")
-    right_label = data.get("right_label", "")
-    left_items = data.get("left_items", [])
-    right_items = data.get("right_items", [])
-    title = _nl(data.get("title", ""))
+def _comparison_css(theme):
     accent = theme['accent']
     accent_sub = theme.get('accent_sub', accent)
-    cur, total = data.get("_page_cur", 0), data.get("_page_total", 0)
-
-    left_html = "".join(
-        f'<div class="item"><span class="item-num">{i+1}</span>{_nl(v)}</div>'
-        for i, v in enumerate(left_items)
-    )
-    right_html = "".join(
-        f'<div class="item"><span class="item-num">{i+1}</span>{_nl(v)}</div>'
-        for i, v in enumerate(right_items)
-    )
-
-    glass_bg = theme.get('glass_bg', 'rgba(255,255,255,0.06)')
-    glass_bd = theme.get('glass_bd', 'rgba(255,255,255,0.12)')
     glass_blur = theme.get('glass_blur', '12px')
-
-    return f"""<!DOCTYPE html><html><head><meta charset="utf-8"><style>
-    {_base_css(theme, cur, total)}
-    .content {{ margin-top: 100px; }}
+    return f"""    .content {{ margin-top: 100px; }}
     h2 {{
         font-size: 40px; margin-bottom: 44px; text-align: center;
         font-weight: 900; letter-spacing: -1.5px;
@@ -629,10 +967,27 @@ def slide_comparison(data, theme, page_info):
         background: rgba(212,175,55,0.15);
         color: {accent};
     }}
-    </style></head><body>
-    {_logo_html(data, theme)}
-    <div class="page-num">{page_info}</div>
-    <div class="content">
+"""
+
+
+@register_slide("comparison", css=_comparison_css)
+def slide_comparison(data, theme):
+    left_label = _esc(data.get("left_label", ""))
+    right_label = _esc(data.get("right_label", ""))
+    left_items = data.get("left_items", [])
+    right_items = data.get("right_items", [])
+    title = _text(data.get("title", ""))
+
+    left_html = "".join(
+        f'<div class="item"><span class="item-num">{i+1}</span>{_text(v)}</div>'
+        for i, v in enumerate(left_items)
+    )
+    right_html = "".join(
+        f'<div class="item"><span class="item-num">{i+1}</span>{_text(v)}</div>'
+        for i, v in enumerate(right_items)
+    )
+
+    return f"""    <div class="content">
         <div class="top-line" style="margin: 0 auto 36px auto;"></div>
         <h2>{title}</h2>
         <div class="columns">
@@ -640,7 +995,7 @@ def slide_comparison(data, theme, page_info):
                 <div class="col-header">{left_label}</div>
                 {left_html}
             </div>
-            <div class="vs-divider">\u2192</div>
+            <div class="vs-divider">→</div>
             <div class="col col-right">
                 <div class="col-header">{right_label}</div>
                 {right_html}
@@ -648,34 +1003,16 @@ def slide_comparison(data, theme, page_info):
         </div>
     </div>
     {_footer_html(data, theme)}
-    {_dot_indicator(cur, total)}
-    </body></html>"""
+"""
 
 
-def slide_summary(data, theme, page_info):
-    title = _nl(data.get("title", ""))
-    items = data.get("items", [])
+def _summary_css(theme):
     accent = theme['accent']
     accent_sub = theme.get('accent_sub', accent)
-    cur, total = data.get("_page_cur", 0), data.get("_page_total", 0)
     glass_bg = theme.get('glass_bg', 'rgba(255,255,255,0.06)')
     glass_bd = theme.get('glass_bd', 'rgba(255,255,255,0.12)')
     glass_blur = theme.get('glass_blur', '12px')
-
-    items_html = ""
-    for i, item in enumerate(items, 1):
-        items_html += f"""
-        <div class="check-item">
-            <div class="check-badge">{i:02d}</div>
-            <div class="check-content">
-                <span class="check-icon">\u2713</span>
-                <span class="check-text">{_nl(item)}</span>
-            </div>
-        </div>"""
-
-    return f"""<!DOCTYPE html><html><head><meta charset="utf-8"><style>
-    {_base_css(theme, cur, total)}
-    .content {{ margin-top: 100px; }}
+    return f"""    .content {{ margin-top: 100px; }}
     h2 {{
         font-size: 42px; margin-bottom: 40px;
         font-weight: 900; letter-spacing: -1.5px;
@@ -714,72 +1051,40 @@ def slide_summary(data, theme, page_info):
         color: {theme['t1']};
         letter-spacing: 0.3px;
     }}
-    </style></head><body>
-    {_logo_html(data, theme)}
-    <div class="page-num">{page_info}</div>
-    <div class="content">
+"""
+
+
+@register_slide("summary", css=_summary_css)
+def slide_summary(data, theme):
+    title = _text(data.get("title", ""))
+    items = data.get("items", [])
+
+    items_html = ""
+    for i, item in enumerate(items, 1):
+        items_html += f"""
+        <div class="check-item">
+            <div class="check-badge">{i:02d}</div>
+            <div class="check-content">
+                <span class="check-icon">✓</span>
+                <span class="check-text">{_text(item)}</span>
+            </div>
+        </div>"""
+
+    return f"""    <div class="content">
         <div class="top-line"></div>
         <h2>{title}</h2>
         {items_html}
     </div>
     {_footer_html(data, theme)}
-    {_dot_indicator(cur, total)}
-    </body></html>"""
+"""
 
 
-def slide_cta(data, theme, page_info):
-    message = _nl(data.get("message", ""))
-    contact = data.get("contact", "")
-    handle = data.get("handle", "")
-    name = data.get("name", "")
-    sub_message = _nl(data.get("sub_message", ""))
+def _cta_css(theme):
     accent = theme['accent']
     accent_sub = theme.get('accent_sub', accent)
-    cur, total = data.get("_page_cur", 0), data.get("_page_total", 0)
-
-    profile_b64 = data.get("_profile_b64", "")
-
     glass_bg = theme.get('glass_bg', 'rgba(255,255,255,0.06)')
-    glass_bd = theme.get('glass_bd', 'rgba(255,255,255,0.12)')
     glass_blur = theme.get('glass_blur', '12px')
-
-    if profile_b64:
-        profile_html = f"""
-        <div class="cta-profile-cutout">
-            <img src="{profile_b64}" />
-        </div>"""
-        contact_section = f"""
-        <div class="cta-right">
-            <h2>{message}</h2>
-            <p class="sub-msg">{sub_message}</p>
-            <div class="cta-contact-box">
-                <div class="cta-name">{name}</div>
-                <div class="cta-phone-btn">
-                    <span class="phone-icon">\u260E</span>
-                    <span>{contact}</span>
-                </div>
-                <div class="cta-handle">{handle}</div>
-            </div>
-        </div>"""
-    else:
-        profile_html = ""
-        contact_section = f"""
-        <div class="cta-center">
-            <h2>{message}</h2>
-            <p class="sub-msg">{sub_message}</p>
-            <div class="cta-contact-box-center">
-                <div class="cta-name">{name}</div>
-                <div class="cta-phone-btn">
-                    <span class="phone-icon">\u260E</span>
-                    <span>{contact}</span>
-                </div>
-                <div class="cta-handle">{handle}</div>
-            </div>
-        </div>"""
-
-    return f"""<!DOCTYPE html><html><head><meta charset="utf-8"><style>
-    {_base_css(theme, cur, total)}
-    /* 방패 워터마크 */
+    return f"""    /* 방패 워터마크 */
     body::after {{
         content: '';
         position: absolute;
@@ -886,10 +1191,54 @@ def slide_cta(data, theme, page_info):
     .cta-contact-box-center .cta-name {{ font-size: 22px; color: {theme['t2']}; margin-bottom: 16px; }}
     .cta-contact-box-center .cta-phone-btn {{ margin-bottom: 12px; }}
     .cta-contact-box-center .cta-handle {{ font-size: 20px; color: {accent_sub}; }}
-    </style></head><body>
-    {_logo_html(data, theme)}
-    <div class="page-num">{page_info}</div>
-    <div class="cta-layout">
+"""
+
+
+@register_slide("cta", css=_cta_css)
+def slide_cta(data, theme):
+    message = _text(data.get("message", ""))
+    contact = _esc(data.get("contact", ""))
+    handle = _esc(data.get("handle", ""))
+    name = _esc(data.get("name", ""))
+    sub_message = _text(data.get("sub_message", ""))
+
+    profile_b64 = data.get("_profile_b64", "")
+
+    if profile_b64:
+        profile_html = f"""
+        <div class="cta-profile-cutout">
+            <img src="{profile_b64}" />
+        </div>"""
+        contact_section = f"""
+        <div class="cta-right">
+            <h2>{message}</h2>
+            <p class="sub-msg">{sub_message}</p>
+            <div class="cta-contact-box">
+                <div class="cta-name">{name}</div>
+                <div class="cta-phone-btn">
+                    <span class="phone-icon">☎</span>
+                    <span>{contact}</span>
+                </div>
+                <div class="cta-handle">{handle}</div>
+            </div>
+        </div>"""
+    else:
+        profile_html = ""
+        contact_section = f"""
+        <div class="cta-center">
+            <h2>{message}</h2>
+            <p class="sub-msg">{sub_message}</p>
+            <div class="cta-contact-box-center">
+                <div class="cta-name">{name}</div>
+                <div class="cta-phone-btn">
+                    <span class="phone-icon">☎</span>
+                    <span>{contact}</span>
+                </div>
+                <div class="cta-handle">{handle}</div>
+            </div>
+        </div>"""
+
+    return f"""    <div class="cta-layout">
         {profile_html}
         {contact_section}
     </div>
@@ -897,72 +1246,579 @@ def slide_cta(data, theme, page_info):
         <div class="footer-brand"><span class="footer-shield"></span><span>{name}</span></div>
         <span>{handle}</span>
     </div></div>
-    {_dot_indicator(cur, total)}
-    </body></html>"""
+"""
+
+
+# ──────────────────────────────────────────────
+# 덱 문서 (슬라이드 전체를 HTML 한 장에)
+# ──────────────────────────────────────────────
+
+_STYLE_RE = re.compile(r"<style>(.*?)</style>", re.S)
+_BODY_RE = re.compile(r"<body>(.*?)</body>", re.S)
+_FONT_RULE_RE = re.compile(r"@import url\([^)]*\);|@font-face \{[^}]*\}")
+_HTML_SEL_RE = re.compile(r"(?m)^(\s*)html \{")
+_BODY_SEL_RE = re.compile(r"(?m)^(\s*)body(::after)? \{")
 
 
-RENDERERS = {
-    "cover": slide_cover,
-    "problem": slide_problem,
-    "point": slide_point,
-    "comparison": slide_comparison,
-    "summary": slide_summary,
-    "cta": slide_cta,
+def deck_document(slide_htmls: list) -> str:
+    """슬라이드 HTML [(filename_base, html_str)] → 1080×1080 섹션을 세로로 쌓은 문서 한 장
+
+    섹션마다 declarative shadow DOM으로 감싸 슬라이드 타입별 CSS(h2, .content 등)가
+    서로 섞이지 않게 하고, html/body 규칙은 :host/.slide-body로 옮긴다.
+    shadow root 안의 @font-face는 무시되므로 폰트 규칙은 문서 <head>로 끌어올린다.
+    섹션 id는 slide-{0부터 인덱스}.
+    """
+    font_rules = []
+    sections = []
+    for idx, (_, html_str) in enumerate(slide_htmls):
+        css = "\n".join(_STYLE_RE.findall(html_str))
+        for rule in _FONT_RULE_RE.findall(css):
+            if rule not in font_rules:
+                font_rules.append(rule)
+        css = _FONT_RULE_RE.sub("", css)
+        css = _HTML_SEL_RE.sub(r"\1:host {", css)
+        css = _BODY_SEL_RE.sub(r"\1.slide-body\2 {", css)
+        body_match = _BODY_RE.search(html_str)
+        body = body_match.group(1) if body_match else ""
+        sections.append(
+            f'<section class="deck-slide" id="slide-{idx}"><template shadowrootmode="open">'
+            f'<style>{css}</style><div class="slide-body">{body}</div></template></section>'
+        )
+    return f"""<!DOCTYPE html><html><head><meta charset="utf-8"><style>
+    {" ".join(font_rules)}
+    html, body {{ margin: 0; padding: 0; background: #000; }}
+    .deck-slide {{ display: block; position: relative; width: {CARD_SIZE}px; height: {CARD_SIZE}px; overflow: hidden; }}
+    </style></head><body>
+{"".join(sections)}
+</body></html>"""
+
+
+# ──────────────────────────────────────────────
+# 스크린샷 (Playwright)
+# ──────────────────────────────────────────────
+
+CARD_SIZE = 1080
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+
+# 출력 규격: 한 번 로드한 페이지에서 규격마다 레이아웃/배율만 바꿔 연달아 캡처
+#   relayout : html/body를 그 크기로 다시 배치 (절대 위치 요소는 새 캔버스 기준으로 이동)
+#   fit      : 1080 카드를 비율 유지 축소해 가운데에 (남는 곳은 배경색)
+#   scale    : deviceScaleFactor (2 → 레티나, 같은 레이아웃을 2배 해상도로)
+OUTPUT_SIZES = {
+    "square": {"width": 1080, "height": 1080, "scale": 1, "fit": "relayout"},
+    "portrait": {"width": 1080, "height": 1350, "scale": 1, "fit": "relayout"},
+    "og": {"width": 1200, "height": 630, "scale": 1, "fit": "fit"},
+    "retina": {"width": 1080, "height": 1080, "scale": 2, "fit": "relayout"},
 }
+_SIZE_RE = re.compile(r"^(\d+)x(\d+)(?:@(\d+(?:\.\d+)?)x?)?(?::(relayout|fit))?$")
+
+_APPLY_SIZE_JS = """([w, h, fit, card]) => {
+    const root = document.documentElement, body = document.body;
+    root.style.width = w + "px"; root.style.height = h + "px";
+    if (fit === "fit") {
+        const s = Math.min(w / card, h / card);
+        const bg = getComputedStyle(body);
+        root.style.backgroundColor = bg.backgroundColor;
+        root.style.backgroundImage = bg.backgroundImage;
+        body.style.width = body.style.height = card + "px";
+        body.style.transformOrigin = "0 0";
+        body.style.transform = `translate(${(w - card * s) / 2}px, ${(h - card * s) / 2}px) scale(${s})`;
+    } else {
+        body.style.width = w + "px"; body.style.height = h + "px";
+        body.style.transform = "";
+    }
+}"""
+
+
+def parse_sizes(spec: str) -> list:
+    """--sizes "square,portrait,og,retina" 또는 "1080x1350@2:fit" 같은 직접 지정 → 규격 dict 목록"""
+    sizes = []
+    for token in (t.strip() for t in (spec or "square").split(",")):
+        if not token:
+            continue
+        if token in OUTPUT_SIZES:
+            sizes.append({"name": token, **OUTPUT_SIZES[token]})
+            continue
+        m = _SIZE_RE.match(token)
+        if not m:
+            raise ValueError(f"출력 규격을 알 수 없음: {token} (예: {','.join(OUTPUT_SIZES)} 또는 1080x1350@2:fit)")
+        w, h, scale, fit = int(m[1]), int(m[2]), float(m[3] or 1), m[4] or "relayout"
+        scale = int(scale) if scale.is_integer() else scale
+        name = f"{w}x{h}" + (f"@{scale}x" if scale != 1 else "") + ("_fit" if fit == "fit" else "")
+        sizes.append({"name": name, "width": w, "height": h, "scale": scale, "fit": fit})
+    return sizes or [{"name": "square", **OUTPUT_SIZES["square"]}]
+
+
+def _size_png(png_path: str, size: dict) -> str:
+    """규격별 PNG 경로: square는 기존 이름 그대로, 나머지는 _{규격} 접미사"""
+    if size["name"] == "square":
+        return png_path
+    stem, ext = os.path.splitext(png_path)
+    return f"{stem}_{size['name']}{ext}"
+
+
+def _png_size(payload: bytes) -> tuple:
+    """PNG bytes → (가로, 세로) 픽셀 (IHDR만 읽음)"""
+    return int.from_bytes(payload[16:20], "big"), int.from_bytes(payload[20:24], "big")
+
+
+def _check_png_size(payload: bytes, size: dict):
+    """캡처한 PNG가 규격의 픽셀 크기(가로·세로 × scale)와 다르면 RuntimeError (배율 에뮬레이션이 풀린 경우 등)"""
+    expected = (round(size["width"] * size["scale"]), round(size["height"] * size["scale"]))
+    actual = _png_size(payload)
+    if actual != expected:
+        raise RuntimeError(f"{size['name']} PNG 크기 {actual[0]}x{actual[1]} ≠ 기대값 {expected[0]}x{expected[1]}")
+
+
+def _is_default_sizes(sizes: list) -> bool:
+    return not sizes or [s["name"] for s in sizes] == ["square"]
+
+
+def _asset_scale(sizes: list) -> float:
+    """카드 CSS px 1개가 출력 PNG에서 차지하는 최대 픽셀 수 (fit은 축소·확대 배율까지 곱함, 최소 1)"""
+    return max([1] + [s["scale"] * (min(s["width"], s["height"]) / CARD_SIZE if s["fit"] == "fit" else 1)
+                      for s in sizes or []])
+
+
+# 자동 맞춤: 본문 블록이 푸터·스와이프 안내 중 위쪽 것(없으면 하단 여백)을 넘으면 글자 크기를 배율 [min, 1] 안에서 이분 탐색
+AUTOFIT_MIN = 0.75
+AUTOFIT_STEPS = 8
+_AUTOFIT_JS = """([minScale, steps, canvas]) => {
+    const box = document.querySelector('.content, .cta-right, .cta-center');
+    if (!box) return null;
+    const edges = [...document.querySelectorAll('.footer, .swipe-hint')].map(el => el.getBoundingClientRect().top);
+    const limit = (edges.length ? Math.min(...edges) : canvas - 80) - 16;
+    const targets = [...box.querySelectorAll('h1, h2, .sub, .body, .item, .check-text, .sub-msg')];
+    const base = targets.map(el => parseFloat(getComputedStyle(el).fontSize));
+    const apply = s => targets.forEach((el, i) => { el.style.fontSize = (base[i] * s).toFixed(2) + 'px'; });
+    const over = () => {
+        const r = box.getBoundingClientRect();
+        return Math.max(r.bottom - limit, -r.top, 0);
+    };
+    const before = over();
+    if (!before) return {scale: 1, before: 0, overflow: 0};
+    apply(minScale);
+    if (over()) return {scale: minScale, before, overflow: over()};
+    let lo = minScale, hi = 1;
+    for (let i = 0; i < steps; i++) {
+        const mid = (lo + hi) / 2;
+        apply(mid);
+        if (over()) hi = mid; else lo = mid;
+    }
+    apply(lo);
+    return {scale: lo, before, overflow: 0};
+}"""
+
+
+def _fit_note(row: dict) -> str:
+    """타이밍 행의 자동 맞춤 결과 한 줄 표기 (조정 안 됐으면 빈 문자열)"""
+    if "fit_scale" not in row:
+        return ""
+    note = f" · 자동 맞춤 ×{row['fit_scale']:.2f}"
+    return note + (f" (여전히 {row['fit_overflow']:.0f}px 넘침)" if row.get("fit_overflow") else "")
+
+
+class CardRasterizer:
+    """Chromium 1회 기동 + 컨텍스트 1개를 유지하고, 페이지 풀을 돌려쓰며 캡처
+
+    여러 덱을 연달아 찍을 때도 같은 인스턴스를 쓰면 브라우저는 한 번만 뜬다.
+    """
+
+    def __init__(self, pages: int = DEFAULT_WORKERS, width: int = CARD_SIZE, height: int = CARD_SIZE,
+                 wait_until: str = "networkidle", sizes: list = None, autofit: float = None):
+        self.pages = max(1, pages)
+        self.wait_until = wait_until
+        self.width = width
+        self.height = height
+        # 출력 규격 (parse_sizes). 기본 square 하나면 규격 전환 없이 기존과 똑같이 찍는다
+        self.sizes = sizes or [{"name": "square", "width": width, "height": height, "scale": 1, "fit": "relayout"}]
+        # 자동 맞춤 최소 배율 (None이면 끔). 1080 캔버스 기준으로 한 번 맞춘 뒤 규격별로 찍는다
+        self.autofit = autofit
+        self._metrics = {}
+        self._cdp = {}  # 페이지별 CDP 세션 — 에뮬레이션 오버라이드는 그 세션이 붙어 있는 동안만 유지된다
+        self._pw = None
+        self._browser = None
+        self._context = None
+        self._pool = None
+
+    async def start(self):
+        from playwright.async_api import async_playwright
+
+        self._pw = await async_playwright().start()
+        # 로컬 폰트(file://)를 file:// 문서에서 불러오려면 필요 (CORS)
+        self._browser = await self._pw.chromium.launch(args=["--allow-file-access-from-files"])
+        self._context = await self._browser.new_context(
+            viewport={"width": self.width, "height": self.height},
+            device_scale_factor=1,
+        )
+        self._pool = asyncio.Queue()
+        for _ in range(self.pages):
+            self._pool.put_nowait(await self._context.new_page())
+        return self
+
+    async def close(self):
+        for cdp in self._cdp.values():
+            await cdp.detach()
+        if self._browser:
+            await self._browser.close()
+        if self._pw:
+            await self._pw.stop()
+        self._pw = self._browser = self._context = self._pool = None
+        self._metrics = {}
+        self._cdp = {}
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def _apply_size(self, page, size: dict):
+        """로드된 페이지를 규격에 맞게: 뷰포트·배율(CDP) 전환 + html/body 재배치"""
+        metrics = (size["width"], size["height"], size["scale"])
+        if self._metrics.get(page, (self.width, self.height, 1)) != metrics:
+            if page not in self._cdp:
+                self._cdp[page] = await self._context.new_cdp_session(page)
+            await self._cdp[page].send("Emulation.setDeviceMetricsOverride", {
+                "width": size["width"], "height": size["height"],
+                "deviceScaleFactor": size["scale"], "mobile": False,
+            })
+            self._metrics[page] = metrics
+        await page.evaluate(_APPLY_SIZE_JS, [size["width"], size["height"], size["fit"], CARD_SIZE])
+
+    async def _shoot(self, html_path: str = None, png_paths: list = None, html: str = None,
+                     wait_until: str = None):
+        """풀에서 페이지를 빌려 로드 → 폰트 대기 → 규격별 스크린샷. ([PNG bytes], 단계별 초) 반환
+
+        html을 주면 파일 대신 set_content로 문자열을 바로 올린다 (디스크를 거치지 않음).
+        """
+        page = await self._pool.get()
+        payloads = []
+        try:
+            t0 = time.perf_counter()
+            if html is None:
+                await page.goto(Path(html_path).resolve().as_uri(), wait_until=wait_until or self.wait_until)
+            else:
+                await page.set_content(html, wait_until=wait_until or self.wait_until)
+            t1 = time.perf_counter()
+            await page.evaluate("document.fonts.ready.then(() => document.fonts.size)")
+            t2 = time.perf_counter()
+            # 하단 기준은 캔버스 높이로 넘긴다 — 이전 슬라이드의 규격 오버라이드가 남아 있으면 innerHeight가 다름
+            fit = (await page.evaluate(_AUTOFIT_JS, [self.autofit, AUTOFIT_STEPS, self.height])
+                   if self.autofit else None)
+            t_fit = time.perf_counter()
+            png_write = 0.0
+            for i, size in enumerate(self.sizes):
+                if not _is_default_sizes(self.sizes):
+                    await self._apply_size(page, size)
+                # clip to exactly the canvas to prevent scrollbar/border clipping
+                payload = await page.screenshot(type="png",
+                                                clip={"x": 0, "y": 0, "width": size["width"], "height": size["height"]})
+                _check_png_size(payload, size)
+                if png_paths:
+                    t_write = time.perf_counter()
+                    _write_bytes(png_paths[i], payload)
+                    png_write += time.perf_counter() - t_write
+                payloads.append(payload)
+            t3 = time.perf_counter()
+        finally:
+            self._pool.put_nowait(page)
+        phases = {"navigate": t1 - t0, "fonts": t2 - t1, "screenshot": t3 - t_fit - png_write, "seconds": t3 - t0}
+        if png_paths:
+            phases["png_write"] = png_write
+        if self.autofit:
+            phases["fit"] = t_fit - t2
+        if fit and fit["scale"] < 1:
+            phases["fit_scale"] = fit["scale"]
+            if fit["overflow"]:
+                phases["fit_overflow"] = fit["overflow"]
+        return payloads, {k: round(v, 4) for k, v in phases.items()}
+
+    async def capture(self, html_path: str, png_path: str) -> dict:
+        """HTML 파일 1개 → 규격별 PNG. 단계별 소요 초(navigate/fonts/screenshot/seconds) 반환
+
+        png_path는 square 기준 경로이고, 다른 규격은 _size_png 접미사 경로에 쓴다.
+        """
+        _, phases = await self._shoot(html_path, [_size_png(png_path, size) for size in self.sizes])
+        return phases
+
+    async def capture_bytes(self, html_path: str):
+        """HTML 파일 1개 → (첫 규격 PNG bytes, 단계별 소요 초). 파일 쓰기는 호출자 몫"""
+        payloads, phases = await self._shoot(html_path)
+        return payloads[0], phases
+
+    async def capture_sizes(self, html_path: str):
+        """HTML 파일 1개 → ([규격별 PNG bytes], 단계별 소요 초)"""
+        return await self._shoot(html_path)
+
+    async def capture_html(self, html: str, wait_until: str = None):
+        """HTML 문자열 → ([규격별 PNG bytes], 단계별 소요 초). 파일을 읽지도 쓰지도 않는다"""
+        return await self._shoot(html=html, wait_until=wait_until)
+
+    async def capture_deck(self, html_files: list, png_files: list) -> list:
+        """덱 문서("deck.html#slide-N") 한 번 로드 → 섹션별 요소 스크린샷"""
+        deck_path = html_files[0].split("#", 1)[0]
+        page = await self._pool.get()
+        try:
+            t0 = time.perf_counter()
+            await page.goto(Path(deck_path).resolve().as_uri(), wait_until=self.wait_until)
+            await page.evaluate("document.fonts.ready.then(() => document.fonts.size)")
+            print(f"  덱 문서 로드 {time.perf_counter() - t0:.2f}s")
+            timings = []
+            for i, (html_ref, png_path) in enumerate(zip(html_files, png_files), 1):
+                t0 = time.perf_counter()
+                payload = await page.locator("#" + html_ref.split("#", 1)[1]).screenshot(type="png")
+                t1 = time.perf_counter()
+                _write_bytes(png_path, payload)
+                t2 = time.perf_counter()
+                seconds = round(t2 - t0, 4)
+                print(f"  [{i}/{len(png_files)}] {os.path.basename(png_path)} ({seconds:.2f}s)")
+                timings.append({"png": os.path.basename(png_path), "screenshot": round(t1 - t0, 4),
+                                "png_write": round(t2 - t1, 4), "seconds": seconds})
+            return timings
+        finally:
+            self._pool.put_nowait(page)
+
+    async def capture_all(self, html_files: list, png_files: list) -> list:
+        """슬라이드를 페이지 풀 크기만큼 동시에 캡처. 슬라이드별 소요 시간 반환
+
+        출력 파일명은 png_files 그대로이므로 완료 순서와 무관하게 고정된다.
+        html_files가 모두 같은 덱 문서의 "#slide-N" 이면 capture_deck으로 넘긴다.
+        """
+        if html_files and all("#" in h for h in html_files) \
+                and len({h.split("#", 1)[0] for h in html_files}) == 1:
+            return await self.capture_deck(html_files, png_files)
+        total = len(html_files)
+        done = 0
+
+        async def _one(html_path, png_path):
+            nonlocal done
+            phases = await self.capture(html_path, png_path)
+            done += 1
+            print(f"  [{done}/{total}] {os.path.basename(png_path)} ({phases['seconds']:.2f}s){_fit_note(phases)}")
+            row = {"png": os.path.basename(png_path), **phases}
+            if not _is_default_sizes(self.sizes):
+                row["sizes"] = [os.path.basename(_size_png(png_path, size)) for size in self.sizes]
+            return row
+
+        return list(await asyncio.gather(*(_one(h, p) for h, p in zip(html_files, png_files))))
+
+
+def _rasterize_worker(decks: list, pages: int, wait_until: str = "networkidle", sizes: list = None,
+                      autofit: float = None) -> list:
+    """프로세스 워커: 브라우저 1개로 할당받은 덱 [(idx, html_files, png_files)]을 차례로 캡처
+
+    덱 하나가 실패해도 나머지는 계속 찍는다. [(idx, timings, seconds, error)] 반환
+    """
+    async def _run():
+        results = []
+        async with CardRasterizer(pages=pages, wait_until=wait_until, sizes=sizes, autofit=autofit) as rasterizer:
+            for idx, html_files, png_files in decks:
+                t0 = time.perf_counter()
+                try:
+                    timings = await rasterizer.capture_all(html_files, png_files)
+                    error = None
+                except Exception as e:  # noqa: BLE001  (덱 단위 격리)
+                    timings, error = [], f"{type(e).__name__}: {e}"
+                results.append((idx, timings, time.perf_counter() - t0, error))
+        return results
+
+    return asyncio.run(_run())
+
+
+def rasterize_decks(decks: list, pages: int = DEFAULT_WORKERS, procs: int = 1,
+                    wait_until: str = "networkidle", sizes: list = None, autofit: float = None) -> list:
+    """여러 덱 [(html_files, png_files), ...] 캡처 → 덱 순서대로 [{timings, seconds, error}]
+
+    procs > 1 이면 덱을 브라우저 프로세스 procs개에 나눠 맡기고,
+    각 프로세스 안에서는 pages개 페이지로 슬라이드를 동시에 찍는다.
+    로컬 폰트를 쓰면 wait_until="load" 로 충분하다 (document.fonts.ready 는 항상 기다림).
+    """
+    indexed = [(i, h, p) for i, (h, p) in enumerate(decks)]
+    procs = max(1, min(procs, len(decks)))
+    t0 = time.perf_counter()
+    if procs == 1:
+        parts = [_rasterize_worker(indexed, pages, wait_until, sizes, autofit)]
+    else:
+        shares = [indexed[i::procs] for i in range(procs)]
+        with ProcessPoolExecutor(max_workers=procs) as pool:
+            parts = list(pool.map(_rasterize_worker, shares, [pages] * procs, [wait_until] * procs,
+                                  [sizes] * procs, [autofit] * procs))
+
+    results = [None] * len(decks)
+    for part in parts:
+        for idx, timings, seconds, error in part:
+            results[idx] = {"timings": timings, "seconds": round(seconds, 4), "error": error}
+    _print_timing([t for r in results for t in r["timings"]], time.perf_counter() - t0, pages, procs)
+    return results
+
+
+def rasterize(html_files: list, png_files: list, pages: int = DEFAULT_WORKERS,
+              wait_until: str = "networkidle", sizes: list = None, autofit: float = None) -> list:
+    """동기 래퍼: 브라우저 1회 기동으로 html_files[i] → png_files[i] 캡처"""
+    result = rasterize_decks([(html_files, png_files)], pages=pages, wait_until=wait_until, sizes=sizes,
+                             autofit=autofit)[0]
+    if result["error"]:
+        raise RuntimeError(result["error"])
+    return result["timings"]
+
+
+def _timing_pngs(output_dir: str, timing: dict) -> list:
+    """타이밍 행 → 그 슬라이드가 만든 PNG 경로 전부 (출력 규격이 여럿이면 규격별로)"""
+    return [os.path.join(output_dir, name) for name in timing.get("sizes", [timing["png"]])]
+
+
+def _print_timing(timings: list, wall: float, pages: int, procs: int):
+    """풀 크기 산정용: 슬라이드 소요 합계 대비 실제 경과 시간"""
+    if not timings:
+        return
+    busy = sum(t["seconds"] for t in timings)
+    slowest = max(timings, key=lambda t: t["seconds"])
+    print(f"\n  캡처 {len(timings)}장 · 프로세스 {procs} × 페이지 {pages}")
+    print(f"  총 경과 {wall:.2f}s · 슬라이드 합계 {busy:.2f}s · 평균 {busy / len(timings):.2f}s"
+          f" · 최장 {slowest['seconds']:.2f}s ({slowest['png']})")
+    phases = [(p, sum(t.get(p) or 0 for t in timings)) for p in ("navigate", "fonts", "fit", "screenshot")]
+    if any(v for _, v in phases):
+        print("  단계 합계 " + " · ".join(f"{p} {v:.2f}s" for p, v in phases if p != "fit" or v))
+    fitted = [t for t in timings if "fit_scale" in t]
+    if fitted:
+        print(f"  자동 맞춤 {len(fitted)}장:")
+        for t in sorted(fitted, key=lambda t: t["png"]):
+            print(f"    {t['png']}{_fit_note(t)}")
+
+
+# ──────────────────────────────────────────────
+# 렌더 캐시 (콘텐츠 해시)
+# ──────────────────────────────────────────────
+
+MANIFEST_NAME = "_render_manifest.json"
+
+
+def _render_key(html_str: str, theme_name: str, width: int = CARD_SIZE, height: int = CARD_SIZE,
+                scale: int = 1) -> str:
+    """최종 HTML + 뷰포트 + 테마 → PNG 캐시 키"""
+    h = hashlib.sha256(f"{theme_name}|{width}x{height}@{scale}\n".encode("utf-8"))
+    h.update(html_str.encode("utf-8"))
+    return h.hexdigest()
+
+
+def _sizes_key(html_str: str, theme_name: str, sizes: list = None, autofit: float = None) -> str:
+    """출력 규격 목록·자동 맞춤까지 포함한 캐시 키 (기본 square 하나, 자동 맞춤 끔이면 _render_key와 같음)"""
+    if autofit:
+        theme_name = f"{theme_name}|fit{autofit}"
+    if _is_default_sizes(sizes):
+        return _render_key(html_str, theme_name)
+    spec = ",".join(f"{s['width']}x{s['height']}@{s['scale']}:{s['fit']}" for s in sizes)
+    return _render_key(html_str, f"{theme_name}|{spec}")
+
+
+def _load_manifest(output_dir: str) -> dict:
+    """{png 파일명: 캐시 키}. 없거나 깨졌으면 빈 dict"""
+    try:
+        with open(os.path.join(output_dir, MANIFEST_NAME), "r", encoding="utf-8") as f:
+            return json.load(f).get("slides", {})
+    except (OSError, ValueError, AttributeError):
+        return {}
+
+
+def _save_manifest(output_dir: str, entries: dict):
+    path = os.path.join(output_dir, MANIFEST_NAME)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"version": 1, "slides": entries}, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
 
 
 # ──────────────────────────────────────────────
 # 메인 파이프라인
 # ──────────────────────────────────────────────
 
-def main():
-    import io
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
-    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+def _safe_name(value, what: str) -> str:
+    """파일 이름에 그대로 들어가는 값(prefix, 슬라이드 type) 검사 — 경로 구분자·'..' 거부"""
+    value = str(value)
+    if not value or "/" in value or "\\" in value or ".." in value:
+        raise ValueError(f"{what}에 경로 구분자나 '..'는 쓸 수 없습니다: {value!r}")
+    return value
 
-    slides_path = sys.argv[1] if len(sys.argv) > 1 else "부당전보_카드뉴스_slides.json"
-    output_dir = sys.argv[2] if len(sys.argv) > 2 else "./output/부당전보_카드뉴스"
 
-    with open(slides_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+def _deck_meta(data) -> dict:
+    """slides JSON 최상위 설정 정리 (슬라이드 리스트만 있으면 기본값)"""
+    meta = data if isinstance(data, dict) else {}
+    theme_name = meta.get("theme", "dark_professional")
+    return {
+        "slides": data.get("slides", data) if isinstance(data, dict) else data,
+        "theme_name": theme_name,
+        "theme": THEMES.get(theme_name, THEMES["dark_professional"]),
+        "prefix": _safe_name(meta.get("prefix", "card"), "prefix"),
+        "footer_name": meta.get("footer_name", ""),
+        "footer_handle": meta.get("footer_handle", ""),
+        "assets_dir": meta.get("assets_dir", ""),
+        "profile_image": meta.get("profile_image", ""),
+        "logo_image": meta.get("logo_image", ""),
+        "profile_name": meta.get("profile_name", ""),
+        "profile_title": meta.get("profile_title", ""),
+    }
 
-    slides = data.get("slides", data) if isinstance(data, dict) else data
-    theme_name = data.get("theme", "dark_professional") if isinstance(data, dict) else "dark_professional"
-    theme = THEMES.get(theme_name, THEMES["dark_professional"])
-    prefix = data.get("prefix", "card") if isinstance(data, dict) else "card"
-    footer_name = data.get("footer_name", "") if isinstance(data, dict) else ""
-    footer_handle = data.get("footer_handle", "") if isinstance(data, dict) else ""
-    assets_dir = data.get("assets_dir", "") if isinstance(data, dict) else ""
-    profile_image = data.get("profile_image", "") if isinstance(data, dict) else ""
-    logo_image = data.get("logo_image", "") if isinstance(data, dict) else ""
-    profile_name = data.get("profile_name", "") if isinstance(data, dict) else ""
-    profile_title = data.get("profile_title", "") if isinstance(data, dict) else ""
-
-    # 프로필/로고 base64
-    profile_b64_map = {}
-    if isinstance(profile_image, dict):
-        for key, path in profile_image.items():
-            resolved = _resolve_image(path, assets_dir)
-            if resolved:
-                profile_b64_map[key] = _img_to_base64(resolved)
-
-    logo_b64 = ""
-    if logo_image:
-        resolved = _resolve_image(logo_image, assets_dir)
-        if resolved:
-            logo_b64 = _img_to_base64(resolved)
 
-    total = len(slides)
-    os.makedirs(output_dir, exist_ok=True)
+def _deck_text(meta: dict) -> str:
+    """embed 서브셋에 넣을 덱 글자 (슬라이드 JSON + 덱 공통 텍스트, 템플릿 글자는 _font_css가 더함)"""
+    return (json.dumps(meta["slides"], ensure_ascii=False) + meta["footer_name"] + meta["footer_handle"]
+            + meta["profile_name"] + meta["profile_title"])
 
-    html_dir = os.path.join(output_dir, "_html")
-    os.makedirs(html_dir, exist_ok=True)
 
-    html_files = []
-    png_files = []
+def _deck_font_css(meta: dict, font_mode: str, font_dir: str, out_dir: str = ""):
+    """덱 단위 폰트 CSS. CDN이면 None (→ _base_css 기본 @import)"""
+    if font_mode == "cdn":
+        return None
+    font_css = _font_css(font_mode, font_dir, _deck_text(meta), out_dir=out_dir)
+    return None if font_css.startswith("@import") else font_css
+
+
+def _subset_glyphs(meta: dict, font_mode: str, font_css: str):
+    """embed 서브셋이 실제로 만들어졌으면 서브셋에 들어간 글자 집합, 아니면 None (local·cdn은 검사 불필요)"""
+    if font_mode != "embed" or not font_css or "url('file:" in font_css:
+        return None
+    return set(_deck_text(meta) + _TEMPLATE_GLYPHS)
+
+
+def _missing_glyphs(html_str: str, glyphs: set) -> str:
+    """렌더링된 HTML의 보이는 글자 중 서브셋에 없는 것 (있으면 그 글자는 대체 폰트로 그려짐)"""
+    visible = set(unescape(_MARKUP_RE.sub(" ", html_str)))
+    return "".join(sorted(c for c in visible - glyphs if not c.isspace()))
 
+
+def _check_glyphs(name: str, html_str: str, glyphs) -> None:
+    if glyphs is None:
+        return
+    missing = _missing_glyphs(html_str, glyphs)
+    if missing:
+        print(f"  [font] {name}: 서브셋에 없는 글자 {missing!r} (대체 폰트로 그려짐)")
+
+
+def iter_slide_html(meta: dict, assets: AssetRegistry, font_css: str = None, css_href: str = None):
+    """슬라이드 순서대로 (filename_base, html_str) 생성
+
+    css_href를 주면 공통 CSS는 인라인 대신 그 스타일시트를 참조한다.
+    """
+    slides = meta["slides"]
+    theme = meta["theme"]
+    footer_name, footer_handle = meta["footer_name"], meta["footer_handle"]
+    profile_name, profile_title = meta["profile_name"], meta["profile_title"]
+    assets_dir = meta["assets_dir"]
+
+    # 프로필/로고 src (inline이면 data URI, link면 file:// URI — 키 이름은 기존 _*_b64 유지)
+    profile_b64_map = {}
+    if isinstance(meta["profile_image"], dict):
+        for key, path in meta["profile_image"].items():
+            src = assets.src(path, assets_dir, IMAGE_BOXES.get(key))
+            if src:
+                profile_b64_map[key] = src
+
+    logo_b64 = assets.src(meta["logo_image"], assets_dir, IMAGE_BOXES["logo"]) if meta["logo_image"] else ""
+
+    total = len(slides)
     for idx, slide in enumerate(slides):
-        slide_type = slide.get("type", "point")
+        slide_type = _safe_name(slide.get("type", "point"), "슬라이드 type")
         renderer = RENDERERS.get(slide_type, RENDERERS["point"])
 
         if footer_name and "footer_name" not in slide:
@@ -974,6 +1830,11 @@ def main():
         slide["_page_cur"] = idx + 1
         slide["_page_total"] = total
 
+        if font_css is not None:
+            slide["_font_css"] = font_css
+        if css_href:
+            slide["_css_href"] = css_href
+
         # 모든 슬라이드에 로고 주입
         if logo_b64 and "_logo_b64" not in slide:
             slide["_logo_b64"] = logo_b64
@@ -987,21 +1848,952 @@ def main():
                 slide["profile_title"] = profile_title
 
         page_info = f"{idx + 1} / {total}"
-        html_str = renderer(slide, theme, page_info)
+        yield f"{meta['prefix']}_{idx + 1:02d}_{slide_type}", renderer(slide, theme, page_info)
 
-        filename_base = f"{prefix}_{idx + 1:02d}_{slide_type}"
-        html_path = os.path.join(html_dir, f"{filename_base}.html")
-        png_path = os.path.join(output_dir, f"{filename_base}.png")
 
-        with open(html_path, "w", encoding="utf-8") as f:
-            f.write(html_str)
+def _write_shared_css(meta: dict, font_css: str, html_dir: str) -> str:
+    """덱 공용 스타일시트를 _html/ 에 한 번 쓰고 상대 href 반환 (내용 해시로 이름을 지어 캐시 키에 반영)"""
+    css = _base_css(meta["theme"], 0, len(meta["slides"]), font_css)
+    filename = f"_base_{hashlib.sha256(css.encode('utf-8')).hexdigest()[:12]}.css"
+    path = os.path.join(html_dir, filename)
+    if not os.path.exists(path):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(css)
+    return filename
 
-        html_files.append(os.path.abspath(html_path))
-        png_files.append(os.path.abspath(png_path))
+
+def _prepare_deck(data, output_dir: str, font_mode: str = "cdn", font_dir: str = "", force: bool = False,
+                  css_mode: str = "inline", deck_doc: bool = False, sizes: list = None,
+                  autofit: float = None) -> dict:
+    """덱 출력 폴더·폰트·공용 CSS·기존 매니페스트 준비"""
+    meta = _deck_meta(data)
+    os.makedirs(output_dir, exist_ok=True)
+    html_dir = os.path.join(output_dir, "_html")
+    os.makedirs(html_dir, exist_ok=True)
+    font_css = _deck_font_css(meta, font_mode, font_dir, out_dir=html_dir)
+    return {
+        "meta": meta,
+        "output_dir": output_dir,
+        "html_dir": html_dir,
+        "font_css": font_css,
+        "glyphs": _subset_glyphs(meta, font_mode, font_css),
+        "css_href": _write_shared_css(meta, font_css, html_dir) if css_mode == "link" and not deck_doc else None,
+        "deck_path": os.path.join(html_dir, f"{meta['prefix']}_deck.html") if deck_doc else None,
+        "manifest": {} if force else _load_manifest(output_dir),
+        "total": len(meta["slides"]),
+        "sizes": sizes,
+        "autofit": autofit,
+    }
+
+
+def _iter_deck_slides(deck: dict, assets: AssetRegistry):
+    """슬라이드별 HTML·경로·캐시 키·캐시 적중 여부"""
+    meta, manifest = deck["meta"], deck["manifest"]
+    slides = iter_slide_html(meta, assets, deck["font_css"], deck["css_href"])
+    for idx in itertools.count():
+        t0 = time.perf_counter()
+        try:
+            filename_base, html_str = next(slides)
+        except StopIteration:
+            return
+        html_path = deck["deck_path"] or os.path.join(deck["html_dir"], f"{filename_base}.html")
+        png_path = os.path.join(deck["output_dir"], f"{filename_base}.png")
+        png_paths = [_size_png(png_path, size) for size in deck["sizes"]] if deck["sizes"] else [png_path]
+        # HTML·뷰포트·테마(·출력 규격·자동 맞춤)가 그대로고 PNG가 남아 있으면 브라우저를 거치지 않는다
+        key = _sizes_key(html_str, meta["theme_name"], deck["sizes"], deck["autofit"])
+        cached = (manifest.get(f"{filename_base}.png") == key and all(map(os.path.exists, png_paths))
+                  and os.path.exists(html_path))
+        if not cached:
+            _check_glyphs(filename_base, html_str, deck["glyphs"])
+        yield {
+            "generate": round(time.perf_counter() - t0, 4),
+            "index": idx,
+            "name": filename_base,
+            "html": html_str,
+            "html_path": html_path,
+            "png_path": png_path,
+            "png_paths": png_paths,
+            "key": key,
+            "cached": cached,
+        }
+
+
+def build_deck(data, output_dir: str, assets: AssetRegistry, font_mode: str = "cdn",
+               font_dir: str = "", force: bool = False, css_mode: str = "inline",
+               deck_doc: bool = False, sizes: list = None, autofit: float = None) -> dict:
+    """HTML 파일 쓰기 + 캐시 판정. 캡처할 목록과 갱신할 매니페스트를 담은 job 반환
+
+    deck_doc이면 슬라이드별 HTML 대신 _html/{prefix}_deck.html 한 장을 쓰고,
+    html_files는 "deck.html#slide-N" 참조가 된다 (공통 CSS는 항상 인라인).
+    """
+    t0 = time.perf_counter()
+    deck = _prepare_deck(data, output_dir, font_mode, font_dir, force, css_mode, deck_doc, sizes, autofit)
+    new_manifest = {}
+    assets_before = assets.seconds
+
+    html_files = []
+    png_files = []
+    slide_htmls = []
+    rows = []
+    total = deck["total"]
+
+    for slide in _iter_deck_slides(deck, assets):
+        idx, filename_base = slide["index"], slide["name"]
+        new_manifest[f"{filename_base}.png"] = slide["key"]
+        if deck_doc:
+            slide_htmls.append((filename_base, slide["html"]))
+        row = {"png": f"{filename_base}.png", "generate": slide["generate"]}
+        rows.append(row)
+        if slide["cached"]:
+            row["cached"] = True
+            print(f"  [{idx+1}/{total}] cached: {filename_base}.png")
+            continue
+
+        if deck_doc:
+            html_files.append(f"{os.path.abspath(deck['deck_path'])}#slide-{idx}")
+        else:
+            t1 = time.perf_counter()
+            with open(slide["html_path"], "w", encoding="utf-8") as f:
+                f.write(slide["html"])
+            row["write"] = round(time.perf_counter() - t1, 4)
+            html_files.append(os.path.abspath(slide["html_path"]))
+        png_files.append(os.path.abspath(slide["png_path"]))
         print(f"  [{idx+1}/{total}] HTML: {filename_base}.html")
 
-    print(f"\nPlaywright screenshot...")
+    if deck_doc and png_files:
+        with open(deck["deck_path"], "w", encoding="utf-8") as f:
+            f.write(deck_document(slide_htmls))
+
+    return {
+        "output_dir": output_dir,
+        "total": total,
+        "html_files": html_files,
+        "png_files": png_files,
+        "manifest": new_manifest,
+        "wait_until": "networkidle" if deck["font_css"] is None else "load",
+        "html_seconds": round(time.perf_counter() - t0, 4),
+        "assets_seconds": round(assets.seconds - assets_before, 4),
+        "rows": rows,
+    }
+
+
+def _job_result(job: dict, timings: list = (), seconds: float = None, error: str = None) -> dict:
+    """build_deck job + 캡처 타이밍 → stream_decks와 같은 모양의 덱 결과 (리포트용)"""
+    captured = {t["png"]: t for t in timings}
+    rows = [{**row, **captured.get(row["png"], {})} for row in job["rows"]]
+    return {
+        "output_dir": job["output_dir"],
+        "total": job["total"],
+        "changed": len(job["png_files"]),
+        "timings": [row for row in rows if row["png"] in captured],
+        "cached": [row for row in rows if row["png"] not in captured],
+        "assets": job["assets_seconds"],
+        "seconds": seconds,
+        "error": error,
+    }
+
+
+# ──────────────────────────────────────────────
+# 스트리밍 파이프라인 (생성 → 캡처 → 쓰기)
+# ──────────────────────────────────────────────
+
+def _write_bytes(path: str, payload: bytes):
+    with open(path, "wb") as f:
+        f.write(payload)
+
+
+async def stream_decks(rasterizer: "CardRasterizer", decks: list, assets: AssetRegistry,
+                       font_mode: str = "cdn", font_dir: str = "", force: bool = False,
+                       css_mode: str = "inline", queue_size: int = 0) -> list:
+    """덱 [(data, output_dir)]을 생산자/소비자 파이프라인으로 렌더링 → 덱별 결과
+
+    생산자가 슬라이드 N+1의 HTML을 만드는 동안 페이지 풀이 슬라이드 N을 캡처하고,
+    PNG 쓰기는 스레드로 넘긴다. 큐는 크기 제한이 있어 덱·슬라이드 수와 무관하게 메모리가 일정하다.
+    rasterizer는 캐시에 없는 첫 슬라이드가 나올 때 기동한다 (닫는 건 호출자 몫).
+    출력 규격은 rasterizer.sizes를 따르고, 규격별 PNG를 한 번의 페이지 로드로 찍는다.
+    """
+    queue_size = queue_size or rasterizer.pages * 2
+    html_q = asyncio.Queue(queue_size)
+    png_q = asyncio.Queue(queue_size)
+    states = []
+
+    def _finish(state):
+        if state["produced"] and state["pending"] == 0 and not state["done"]:
+            state["done"] = True
+            state["seconds"] = round(time.perf_counter() - state["t0"], 4)
+            if not state["error"]:
+                _save_manifest(state["output_dir"], state["manifest"])
+
+    async def produce():
+        for data, output_dir in decks:
+            state = {"output_dir": output_dir, "total": 0, "changed": 0, "pending": 0, "manifest": {},
+                     "timings": [], "cached": [], "assets": 0.0, "error": None,
+                     "produced": False, "done": False, "t0": time.perf_counter()}
+            states.append(state)
+            assets_before = assets.seconds
+            try:
+                deck = _prepare_deck(data, output_dir, font_mode, font_dir, force, css_mode,
+                                     sizes=rasterizer.sizes, autofit=rasterizer.autofit)
+                state["total"] = deck["total"]
+                for slide in _iter_deck_slides(deck, assets):
+                    png_name = f"{slide['name']}.png"
+                    state["manifest"][png_name] = slide["key"]
+                    if slide["cached"]:
+                        state["cached"].append({"png": png_name, "generate": slide["generate"], "cached": True})
+                        print(f"  [{slide['index']+1}/{deck['total']}] cached: {png_name}")
+                        continue
+                    t0 = time.perf_counter()
+                    with open(slide["html_path"], "w", encoding="utf-8") as f:
+                        f.write(slide["html"])
+                    row = {"png": png_name, "generate": slide["generate"],
+                           "write": round(time.perf_counter() - t0, 4)}
+                    if not _is_default_sizes(rasterizer.sizes):
+                        row["sizes"] = [os.path.basename(path) for path in slide["png_paths"]]
+                    if rasterizer._context is None:
+                        await rasterizer.start()
+                    state["changed"] += 1
+                    state["pending"] += 1
+                    await html_q.put((state, slide["html_path"], slide["png_paths"], row))
+            except ImportError:
+                raise
+            except Exception as e:  # noqa: BLE001  (덱 단위 격리)
+                state["error"] = f"{type(e).__name__}: {e}"
+                print(f"  실패 {output_dir}: {state['error']}")
+            state["assets"] = round(assets.seconds - assets_before, 4)
+            state["produced"] = True
+            _finish(state)
+
+    async def capture_worker():
+        while (item := await html_q.get()) is not None:
+            state, html_path, png_paths, row = item
+            try:
+                payloads, phases = await rasterizer.capture_sizes(html_path)
+            except Exception as e:  # noqa: BLE001
+                state["error"] = state["error"] or f"{type(e).__name__}: {e}"
+                state["pending"] -= 1
+                _finish(state)
+                continue
+            row.update(phases)
+            await png_q.put((state, png_paths, payloads, row))
+
+    async def write_worker():
+        while (item := await png_q.get()) is not None:
+            state, png_paths, payloads, row = item
+            try:
+                t0 = time.perf_counter()
+                for png_path, payload in zip(png_paths, payloads):
+                    await asyncio.to_thread(_write_bytes, png_path, payload)
+                row["png_write"] = round(time.perf_counter() - t0, 4)
+                state["timings"].append(row)
+                print(f"  [{len(state['timings'])}/{state['total']}] {row['png']} ({row['seconds']:.2f}s)"
+                      f"{_fit_note(row)}")
+            except OSError as e:
+                state["error"] = state["error"] or f"{type(e).__name__}: {e}"
+            state["pending"] -= 1
+            _finish(state)
+
+    workers = [asyncio.create_task(capture_worker()) for _ in range(rasterizer.pages)]
+    writer = asyncio.create_task(write_worker())
+    try:
+        await produce()
+        for _ in workers:
+            await html_q.put(None)
+        await asyncio.gather(*workers)
+        await png_q.put(None)
+        await writer
+    finally:
+        for task in workers + [writer]:
+            task.cancel()
+
+    return [{key: state[key] for key in ("output_dir", "total", "changed", "timings", "cached", "assets",
+                                         "seconds", "error")}
+            for state in states]
+
+
+def run_stream(decks: list, args, assets: AssetRegistry = None) -> list:
+    """동기 래퍼: 브라우저 1개로 stream_decks 실행 + 타이밍 출력"""
+    assets = assets or _asset_registry(args)
+    wait_until = "networkidle" if args.font == "cdn" else "load"
+
+    async def _run():
+        rasterizer = CardRasterizer(pages=args.workers, wait_until=wait_until, sizes=args.sizes,
+                                    autofit=args.autofit)
+        try:
+            return await stream_decks(rasterizer, decks, assets, args.font, args.font_dir, args.force, args.css)
+        finally:
+            await rasterizer.close()
+
+    t0 = time.perf_counter()
+    results = asyncio.run(_run())
+    _print_timing([t for r in results for t in r["timings"]], time.perf_counter() - t0, args.workers, 1)
+    return results
+
+
+def _batch_paths(spec: str) -> list:
+    """--batch 대상: glob 패턴, 또는 slides 경로 목록(.txt 한 줄에 하나 / .json 리스트)"""
+    if os.path.isfile(spec) and spec.lower().endswith((".txt", ".json")) and not spec.endswith("_slides.json"):
+        base = os.path.dirname(os.path.abspath(spec))
+        with open(spec, "r", encoding="utf-8") as f:
+            if spec.lower().endswith(".json"):
+                entries = json.load(f)
+                entries = entries.get("decks", []) if isinstance(entries, dict) else entries
+            else:
+                entries = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+        return [p if os.path.isabs(p) else os.path.join(base, p) for p in entries]
+    return sorted(glob.glob(spec, recursive=True))
+
+
+def _deck_name(slides_path: str) -> str:
+    """부당전보_카드뉴스_slides.json → 부당전보_카드뉴스"""
+    stem = Path(slides_path).stem
+    return stem[:-len("_slides")] if stem.endswith("_slides") else stem
+
+
+def run_batch(slides_paths: list, output_root: str, args) -> int:
+    """여러 덱을 한 프로세스에서: 에셋 레지스트리·브라우저 공유, 덱별 결과를 요약 파일로"""
+    t0 = time.perf_counter()
+    assets = _asset_registry(args)
+    summary = []
+    jobs = []
+
+    if args.procs == 1 and not args.deck_doc and not args.html_only:
+        return _run_batch_stream(slides_paths, output_root, args, assets, t0)
+
+    for slides_path in slides_paths:
+        output_dir = os.path.join(output_root, _deck_name(slides_path))
+        entry = {"slides": slides_path, "output_dir": output_dir, "error": None}
+        summary.append(entry)
+        print(f"\n[{len(summary)}/{len(slides_paths)}] {slides_path}")
+        try:
+            with open(slides_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            job = build_deck(data, output_dir, assets, args.font, args.font_dir, args.force, args.css,
+                             args.deck_doc, args.sizes, args.autofit)
+        except Exception as e:  # noqa: BLE001  (덱 단위 격리)
+            entry["error"] = f"{type(e).__name__}: {e}"
+            print(f"  실패: {entry['error']}")
+            continue
+        entry.update(slides_total=job["total"], changed=len(job["png_files"]),
+                     cached=job["total"] - len(job["png_files"]), html_seconds=job["html_seconds"])
+        if job["png_files"]:
+            jobs.append((entry, job))
+
+    if jobs and not args.html_only:
+        print(f"\nPlaywright screenshot... ({sum(len(j['png_files']) for _, j in jobs)} slides / {len(jobs)} decks)")
+        try:
+            results = rasterize_decks([(j["html_files"], j["png_files"]) for _, j in jobs],
+                                      pages=args.workers, procs=args.procs, wait_until=jobs[0][1]["wait_until"],
+                                      sizes=args.sizes, autofit=args.autofit)
+        except ImportError:
+            print("  playwright 미설치: pip install playwright && playwright install chromium")
+            return 1
+        for (entry, job), result in zip(jobs, results):
+            job["result"] = _job_result(job, result["timings"], result["seconds"], result["error"])
+            entry["capture_seconds"] = result["seconds"]
+            entry["error"] = result["error"]
+            if not result["error"]:
+                _save_manifest(job["output_dir"], job["manifest"])
+        os.makedirs(output_root, exist_ok=True)
+        _postprocess([png for (_, job), result in zip(jobs, results) for t in result["timings"]
+                      for png in _timing_pngs(job["output_dir"], t)], args, output_root)
+
+    if args.report:
+        write_render_report([job.get("result") or _job_result(job) for _, job in jobs], output_root)
+    return _write_batch_summary(summary, output_root, t0)
+
+
+def _run_batch_stream(slides_paths: list, output_root: str, args, assets: AssetRegistry, t0: float) -> int:
+    """--batch 기본 경로: 모든 덱을 브라우저 1개짜리 스트리밍 파이프라인 하나로"""
+    summary = []
+    decks = []
+    for slides_path in slides_paths:
+        output_dir = os.path.join(output_root, _deck_name(slides_path))
+        entry = {"slides": slides_path, "output_dir": output_dir, "error": None}
+        summary.append(entry)
+        try:
+            with open(slides_path, "r", encoding="utf-8") as f:
+                decks.append((json.load(f), output_dir))
+        except (OSError, ValueError) as e:
+            entry["error"] = f"{type(e).__name__}: {e}"
+            print(f"  실패 {slides_path}: {entry['error']}")
+
+    print(f"\nPlaywright streaming... ({len(decks)} decks)")
+    try:
+        results = run_stream(decks, args, assets)
+    except ImportError:
+        print("  playwright 미설치: pip install playwright && playwright install chromium")
+        return 1
+    by_dir = {r["output_dir"]: r for r in results}
+    for entry in summary:
+        result = by_dir.get(entry["output_dir"])
+        if result and not entry["error"]:
+            entry.update(slides_total=result["total"], changed=result["changed"],
+                         cached=result["total"] - result["changed"], seconds=result["seconds"],
+                         error=result["error"])
+    os.makedirs(output_root, exist_ok=True)
+    _postprocess([png for r in results for t in r["timings"] for png in _timing_pngs(r["output_dir"], t)],
+                 args, output_root)
+    if args.report:
+        write_render_report(results, output_root)
+    return _write_batch_summary(summary, output_root, t0)
+
+
+def _write_batch_summary(summary: list, output_root: str, t0: float) -> int:
+    wall = time.perf_counter() - t0
+    failed = [e for e in summary if e["error"]]
+    os.makedirs(output_root, exist_ok=True)
+    with open(os.path.join(output_root, "_batch_summary.json"), "w", encoding="utf-8") as f:
+        json.dump({"wall_seconds": round(wall, 4), "decks": summary, "failed": len(failed)},
+                  f, ensure_ascii=False, indent=2)
+
+    print(f"\n덱 {len(summary)}개 · 실패 {len(failed)}개 · 총 {wall:.2f}s")
+    for e in summary:
+        if e["error"]:
+            status = f"실패 {e['error']}"
+        elif "seconds" in e:
+            status = f"변경 {e.get('changed', 0)}장 / 캐시 {e.get('cached', 0)}장 · {e['seconds']:.2f}s"
+        else:
+            status = (f"변경 {e.get('changed', 0)}장 / 캐시 {e.get('cached', 0)}장 · "
+                      f"HTML {e.get('html_seconds', 0):.2f}s · 캡처 {e.get('capture_seconds', 0):.2f}s")
+        print(f"  {_deck_name(e['slides'])}: {status}")
+    return 1 if failed else 0
+
+
+# ──────────────────────────────────────────────
+# PNG 후처리 (무손실 최적화 · WebP/AVIF 변형)
+# ──────────────────────────────────────────────
+
+IMAGE_VARIANTS = ("webp", "avif")
+OPTIMIZE_REPORT_NAME = "_optimize_report.json"
+
+
+def _optimize_one(png_path: str, optimize: bool = True, quantize: bool = False, variants: tuple = (),
+                  quality: int = 90) -> dict:
+    """PNG 1장 재압축(무손실, quantize면 256색 팔레트) + 옆에 변형 저장. 프로세스 풀 워커"""
+    from PIL import Image
+
+    t0 = time.perf_counter()
+    before = os.path.getsize(png_path)
+    with Image.open(png_path) as im:
+        im.load()
+
+    after = before
+    if optimize or quantize:
+        out = im.quantize(colors=256, method=Image.Quantize.FASTOCTREE) if quantize else im
+        buf = io.BytesIO()
+        out.save(buf, "PNG", optimize=True)
+        if buf.tell() < before:
+            tmp = png_path + ".tmp"
+            _write_bytes(tmp, buf.getvalue())
+            os.replace(tmp, png_path)
+            after = buf.tell()
+
+    report = {"png": png_path, "before": before, "after": after, "saved": before - after, "variants": {}}
+    for fmt in variants:
+        if fmt == "avif":
+            try:
+                import pillow_avif  # noqa: F401  (Pillow 11.3 미만은 플러그인 필요)
+            except ImportError:
+                pass
+        variant_path = os.path.splitext(png_path)[0] + f".{fmt}"
+        try:
+            im.convert("RGB").save(variant_path, fmt.upper(), quality=quality)
+            report["variants"][fmt] = os.path.getsize(variant_path)
+        except (KeyError, OSError, ValueError) as e:
+            report["variants"][fmt] = f"{type(e).__name__}: {e}"
+    report["seconds"] = round(time.perf_counter() - t0, 4)
+    return report
+
+
+def postprocess_pngs(png_paths: list, optimize: bool = True, quantize: bool = False, variants: tuple = (),
+                     quality: int = 90, procs: int = 0) -> list:
+    """캡처가 끝난 PNG들을 프로세스 풀에서 최적화/변환 → 파일별 리포트"""
+    if not png_paths:
+        return []
+    procs = procs or os.cpu_count() or 1
+    n = len(png_paths)
+    with ProcessPoolExecutor(max_workers=min(procs, n)) as pool:
+        return list(pool.map(_optimize_one, png_paths, [optimize] * n, [quantize] * n,
+                             [tuple(variants)] * n, [quality] * n))
+
+
+def _postprocess(png_paths: list, args, report_dir: str):
+    """--optimize / --quantize / --variants 가 켜져 있으면 후처리하고 리포트를 report_dir에 남김"""
+    variants = tuple(v.strip().lower() for v in args.variants.split(",") if v.strip())
+    if not (args.optimize or args.quantize or variants) or not png_paths:
+        return
+    print(f"\nPNG 후처리... ({len(png_paths)}장)")
+    try:
+        reports = postprocess_pngs(png_paths, args.optimize, args.quantize, variants, args.quality)
+    except ImportError:
+        print("  Pillow 미설치: pip install pillow")
+        return
+    for r in reports:
+        pct = 100 * r["saved"] / r["before"] if r["before"] else 0
+        line = f"  {os.path.basename(r['png'])}: {r['before'] // 1024}KB → {r['after'] // 1024}KB (-{pct:.1f}%)"
+        for fmt, size in r["variants"].items():
+            line += f" · {fmt} {size // 1024}KB" if isinstance(size, int) else f" · {fmt} 실패({size})"
+        print(f"{line} · {r['seconds']:.2f}s")
+    saved = sum(r["saved"] for r in reports)
+    print(f"  합계 {saved // 1024}KB 절감")
+    with open(os.path.join(report_dir, OPTIMIZE_REPORT_NAME), "w", encoding="utf-8") as f:
+        json.dump({"files": reports, "saved": saved}, f, ensure_ascii=False, indent=2)
+
+
+# ──────────────────────────────────────────────
+# 타이밍 리포트 · 프로파일
+# ──────────────────────────────────────────────
+
+# screenshot: Chromium 캡처(PNG 인코딩은 Chromium 안에서 함께 끝나 따로 잴 수 없음), png_write: PNG 파일 쓰기
+REPORT_PHASES = ("generate", "write", "navigate", "fonts", "fit", "screenshot", "png_write")
+REPORT_NAME = "_render_report"
+
+
+def write_render_report(results: list, report_dir: str):
+    """덱별 결과(stream_decks 형식) → _render_report.json(덱 합계+슬라이드별) / .csv(슬라이드별)"""
+    rows = []
+    decks = []
+    for r in results:
+        deck_rows = [{"deck": r["output_dir"], **row} for row in r.get("cached", []) + r.get("timings", [])]
+        rows.extend(deck_rows)
+        decks.append({
+            "deck": r["output_dir"],
+            "slides": r.get("total", len(deck_rows)),
+            "captured": len(r.get("timings", [])),
+            "assets": r.get("assets", 0.0),
+            "wall": r.get("seconds"),
+            "error": r.get("error"),
+            **{phase: round(sum(row.get(phase) or 0 for row in deck_rows), 4) for phase in REPORT_PHASES},
+        })
+
+    os.makedirs(report_dir, exist_ok=True)
+    with open(os.path.join(report_dir, f"{REPORT_NAME}.json"), "w", encoding="utf-8") as f:
+        json.dump({"phases": REPORT_PHASES, "decks": decks, "slides": rows}, f, ensure_ascii=False, indent=2)
+    columns = ("deck", "png", "cached") + REPORT_PHASES + ("seconds", "fit_scale", "fit_overflow")
+    with open(os.path.join(report_dir, f"{REPORT_NAME}.csv"), "w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=columns, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)
+    print(f"  리포트: {os.path.join(report_dir, REPORT_NAME)}.json / .csv")
+
+
+# ──────────────────────────────────────────────
+# 라이브러리 API (디스크 없이 메모리에서 렌더링)
+# ──────────────────────────────────────────────
+
+def _memory_slides(data, assets: AssetRegistry, font_mode: str, font_dir: str):
+    """slides dict → ([(filename_base, html_str)], wait_until). 호출자의 dict는 건드리지 않는다
+
+    set_content로 올린 문서(about:blank)는 file:// 리소스를 못 읽으므로
+    이미지는 inline(data URI), 폰트는 cdn 또는 embed(data URI 서브셋)만 쓸 수 있다.
+    """
+    if assets.mode != "inline":
+        raise ValueError("메모리 렌더링은 inline 에셋만 지원합니다 (link는 file:// 문서 필요)")
+    meta = _deck_meta(data)
+    meta["slides"] = [dict(slide) for slide in meta["slides"]]  # iter_slide_html이 _page_cur 등을 주입
+    font_css = _deck_font_css(meta, font_mode, font_dir)
+    if font_css and "url('file:" in font_css:
+        raise ValueError("메모리 렌더링은 font='cdn' 또는 'embed'(fontTools 필요)만 지원합니다")
+    glyphs = _subset_glyphs(meta, font_mode, font_css)
+    slides = list(iter_slide_html(meta, assets, font_css))
+    for name, html_str in slides:
+        _check_glyphs(name, html_str, glyphs)
+    return slides, "networkidle" if font_css is None else "load"
+
+
+async def render_deck_async(data, rasterizer: CardRasterizer = None, assets: AssetRegistry = None,
+                            font: str = "cdn", font_dir: str = "fonts", sizes=None, autofit: float = None) -> list:
+    """slides dict(slides JSON과 같은 모양) → 슬라이드별 {"name", "png", "sizes", "phases"}
+
+    png는 첫 규격의 PNG bytes, sizes는 {규격 이름: PNG bytes}. HTML·PNG 모두 파일로 쓰지 않는다.
+    rasterizer를 넘기면 그 브라우저·페이지 풀을 재사용하고(start/close는 호출자 몫, sizes 무시),
+    없으면 이번 호출용으로 띄웠다가 닫는다. sizes는 parse_sizes 결과 또는 "square,og" 같은 문자열,
+    autofit은 자동 맞춤 최소 배율 (phases에 fit_scale이 있으면 조정된 슬라이드).
+    """
+    assets = assets or AssetRegistry("inline")
+    slides, wait_until = _memory_slides(data, assets, font, font_dir)
+    own = rasterizer is None
+    if own:
+        rasterizer = await CardRasterizer(sizes=parse_sizes(sizes) if isinstance(sizes, str) else sizes,
+                                          autofit=autofit).start()
+    try:
+        shots = await asyncio.gather(*(rasterizer.capture_html(html, wait_until) for _, html in slides))
+    finally:
+        if own:
+            await rasterizer.close()
+    return [{"name": name, "png": payloads[0],
+             "sizes": {size["name"]: payload for size, payload in zip(rasterizer.sizes, payloads)},
+             "phases": phases}
+            for (name, _), (payloads, phases) in zip(slides, shots)]
+
+
+def render_deck(data, **kwargs) -> list:
+    """render_deck_async의 동기 버전. 호출마다 Chromium을 띄우므로 반복 호출은 CardRenderer를 쓴다"""
+    return asyncio.run(render_deck_async(data, **kwargs))
+
+
+class CardRenderer:
+    """동기 코드에서 Chromium 1개를 계속 띄워 두고 render()를 반복 호출
+
+    캡처는 전용 이벤트 루프 스레드의 CardRasterizer가 맡는다 (RenderService와 같은 구조).
+
+        with CardRenderer(pages=4) as renderer:
+            for slide in renderer.render(data):
+                upload(f"{slide['name']}.png", slide["png"])
+    """
+
+    def __init__(self, pages: int = DEFAULT_WORKERS, font: str = "cdn", font_dir: str = "fonts",
+                 sizes=None, assets: AssetRegistry = None, autofit: float = None):
+        self.font = font
+        self.font_dir = font_dir
+        self.assets = assets or AssetRegistry("inline")
+        self._loop = asyncio.new_event_loop()
+        threading.Thread(target=self._loop.run_forever, daemon=True).start()
+        self.rasterizer = CardRasterizer(pages=pages, sizes=parse_sizes(sizes) if isinstance(sizes, str) else sizes,
+                                         autofit=autofit)
+        try:
+            self._call(self.rasterizer.start())
+        except BaseException:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            raise
+
+    def _call(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def render(self, data) -> list:
+        """slides dict → 슬라이드별 {"name", "png", "sizes", "phases"} (render_deck_async와 같음)"""
+        return self._call(render_deck_async(data, self.rasterizer, self.assets, self.font, self.font_dir))
+
+    def close(self):
+        self._call(self.rasterizer.close())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ──────────────────────────────────────────────
+# 렌더 데몬 (로컬 HTTP)
+# ──────────────────────────────────────────────
+
+class QueueFull(Exception):
+    pass
+
+
+def _request_deck(data):
+    """요청 JSON의 슬라이드에서 렌더러가 주입하는 내부 키(_font_css, _logo_b64, _css_href 등 '_'로 시작)를 뺀 사본
+
+    내부 키는 이스케이프 없이 페이지에 들어가므로 클라이언트 값은 받지 않는다.
+    """
+    def clean(slides):
+        if not isinstance(slides, list):
+            raise ValueError("slides는 리스트여야 합니다")
+        return [{k: v for k, v in slide.items() if not str(k).startswith("_")} for slide in slides]
+
+    if isinstance(data, dict):
+        return {**data, "slides": clean(data.get("slides", []))}
+    return clean(data)
+
+
+class RenderService:
+    """테마·인코딩된 에셋·따뜻한 Chromium을 메모리에 들고 요청마다 덱을 렌더링
+
+    HTTP 핸들러 스레드에서 render()를 부르고, 캡처는 전용 이벤트 루프 스레드의
+    CardRasterizer 하나가 맡는다. 동시 캡처 수는 페이지 풀(--workers),
+    대기 포함 동시 요청 수는 --queue 로 제한하고 넘치면 QueueFull.
+    """
+
+    def __init__(self, args, output_root: str):
+        self.args = args
+        self.output_root = os.path.abspath(output_root)
+        self.assets = _asset_registry(args)
+        self._slots = threading.BoundedSemaphore(args.queue)
+        self._dir_locks = {}
+        self._dir_locks_guard = threading.Lock()
+        self._loop = asyncio.new_event_loop()
+        threading.Thread(target=self._loop.run_forever, daemon=True).start()
+        wait_until = "networkidle" if args.font == "cdn" else "load"
+        self.rasterizer = CardRasterizer(pages=args.workers, wait_until=wait_until, sizes=args.sizes,
+                                         autofit=args.autofit)
+        self._call(self.rasterizer.start())
+
+    def _call(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def close(self):
+        self._call(self.rasterizer.close())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+    def _lock_for(self, output_dir: str) -> threading.Lock:
+        with self._dir_locks_guard:
+            return self._dir_locks.setdefault(output_dir, threading.Lock())
+
+    def output_dir_for(self, data, out: str = None) -> str:
+        """요청별 출력 폴더: 지정값(output_root 하위만 허용) 또는 output_root/prefix"""
+        output_dir = os.path.abspath(os.path.join(self.output_root, out or _deck_meta(data)["prefix"]))
+        if os.path.commonpath([output_dir, self.output_root]) != self.output_root:
+            raise ValueError(f"출력 폴더는 {self.output_root} 하위여야 합니다: {out or output_dir}")
+        return output_dir
+
+    def render(self, data, out: str = None, slide: int = None) -> dict:
+        """덱 렌더링 → {"pngs": [경로...], "sizes": {규격: [경로...]}, "captured", "cached", "seconds"}
+
+        slide(1부터)를 주면 그 슬라이드만 캡처한다 (미리보기용). 변경 없는 슬라이드는 캐시 PNG 재사용.
+        pngs는 첫 --sizes 규격의 PNG (기본 square면 기존과 같은 경로).
+        """
+        if not self._slots.acquire(blocking=False):
+            raise QueueFull()
+        try:
+            data = _request_deck(data)
+            output_dir = self.output_dir_for(data, out)
+            with self._lock_for(output_dir):
+                t0 = time.perf_counter()
+                args = self.args
+                job = build_deck(data, output_dir, self.assets, args.font, args.font_dir, False,
+                                 args.css, args.deck_doc, args.sizes, args.autofit)
+                pngs = [os.path.abspath(os.path.join(output_dir, name)) for name in job["manifest"]]
+                pairs = list(zip(job["html_files"], job["png_files"]))
+                if slide is not None:
+                    if not 1 <= slide <= len(pngs):
+                        raise ValueError(f"slide는 1~{len(pngs)} 범위: {slide}")
+                    pairs = [(h, p) for h, p in pairs if p == pngs[slide - 1]]
+                    pngs = [pngs[slide - 1]]
+                if pairs:
+                    self._call(self.rasterizer.capture_all([h for h, _ in pairs], [p for _, p in pairs]))
+                # 이번에 찍지 않은(미리보기에서 건너뛴) 슬라이드는 매니페스트에 남기지 않는다
+                skipped = set(job["png_files"]) - {p for _, p in pairs}
+                _save_manifest(output_dir, {name: key for name, key in job["manifest"].items()
+                                            if os.path.abspath(os.path.join(output_dir, name)) not in skipped})
+                sizes = {size["name"]: [_size_png(p, size) for p in pngs] for size in self.rasterizer.sizes}
+                return {
+                    "pngs": next(iter(sizes.values())),
+                    "sizes": sizes,
+                    "captured": len(pairs),
+                    "cached": job["total"] - len(job["png_files"]),
+                    "seconds": round(time.perf_counter() - t0, 4),
+                }
+        finally:
+            self._slots.release()
+
+
+class _RenderHandler(BaseHTTPRequestHandler):
+    """GET /health, POST /render[?slide=N&out=하위폴더] (본문: slides JSON)
+
+    slide를 주면 첫 규격의 PNG 바이트(image/png), 아니면 PNG 경로 목록 JSON을 돌려준다.
+    """
+
+    service = None
+
+    def _send(self, status: int, body: bytes, content_type: str):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _json(self, status: int, payload: dict):
+        self._send(status, json.dumps(payload, ensure_ascii=False).encode("utf-8"),
+                   "application/json; charset=utf-8")
+
+    def do_GET(self):
+        if urlsplit(self.path).path == "/health":
+            self._json(200, {"ok": True, "workers": self.service.args.workers, "queue": self.service.args.queue})
+        else:
+            self._json(404, {"error": "not found"})
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        if url.path != "/render":
+            self._json(404, {"error": "not found"})
+            return
+        qs = parse_qs(url.query)
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            data = json.loads(self.rfile.read(length).decode("utf-8"))
+            slide = int(qs["slide"][0]) if "slide" in qs else None
+            result = self.service.render(data, qs.get("out", [None])[0], slide)
+        except QueueFull:
+            self._json(503, {"error": "render queue full"})
+            return
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            self._json(400, {"error": f"{type(e).__name__}: {e}"})
+            return
+        except Exception as e:  # noqa: BLE001
+            self._json(500, {"error": f"{type(e).__name__}: {e}"})
+            return
+
+        if slide is not None:
+            with open(result["pngs"][0], "rb") as f:
+                self._send(200, f.read(), "image/png")
+        else:
+            self._json(200, result)
+
+
+def serve(args, output_root: str) -> int:
+    """렌더 데몬 실행 (Ctrl+C로 종료)"""
+    try:
+        service = RenderService(args, output_root)
+    except ImportError:
+        print("  playwright 미설치: pip install playwright && playwright install chromium")
+        return 1
+    handler = type("RenderHandler", (_RenderHandler,), {"service": service})
+    server = ThreadingHTTPServer((args.host, args.port), handler)
+    print(f"렌더 데몬: http://{args.host}:{args.port}  (POST /render, GET /health)")
+    print(f"  출력 루트 {service.output_root} · 페이지 {args.workers} · 대기열 {args.queue}"
+          f" · 규격 {','.join(size['name'] for size in service.rasterizer.sizes)}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+    return 0
+
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="카드뉴스 slides JSON → HTML → PNG")
+    parser.add_argument("slides_path", nargs="?", default="부당전보_카드뉴스_slides.json",
+                        help="slides JSON (--batch면 glob 패턴 또는 목록 파일 .txt/.json)")
+    parser.add_argument("output_dir", nargs="?", default=None,
+                        help="출력 폴더 (기본 ./output/부당전보_카드뉴스, --batch면 덱별 하위 폴더를 만들 루트 ./output)")
+    parser.add_argument("--batch", action="store_true", help="여러 덱을 한 번에 렌더링")
+    parser.add_argument("--serve", action="store_true", help="로컬 HTTP 렌더 데몬으로 실행 (출력 루트 기본 ./output)")
+    parser.add_argument("--host", default="127.0.0.1", help="--serve 바인드 주소")
+    parser.add_argument("--port", type=int, default=8765, help="--serve 포트")
+    parser.add_argument("--queue", type=int, default=16, help="--serve 동시 요청(대기 포함) 상한")
+    parser.add_argument("-w", "--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"동시에 캡처할 페이지 수 (기본 {DEFAULT_WORKERS})")
+    parser.add_argument("--procs", type=int, default=1, help="--batch에서 덱을 나눠 맡을 브라우저 프로세스 수")
+    parser.add_argument("--html-only", action="store_true", help="HTML만 만들고 캡처는 생략")
+    parser.add_argument("--font", choices=FONT_MODES, default="cdn",
+                        help="Pretendard 로딩: cdn(기본) / local(--font-dir 참조) / embed(서브셋 내장)")
+    parser.add_argument("--font-dir", default="fonts", help="Pretendard-*.woff2 등이 있는 폴더")
+    parser.add_argument("--assets", choices=ASSET_MODES, default="inline",
+                        help="로고/프로필 이미지: inline(data URI, 기본) / link(file:// 공유 참조)")
+    parser.add_argument("--image-cache", metavar="DIR", default=None,
+                        help="프로필/로고를 표시 크기로 줄여 DIR에 캐시하고 그 변형을 사용 (Pillow 있으면 축소)")
+    parser.add_argument("--css", choices=CSS_MODES, default="inline",
+                        help="공통 CSS: inline(슬라이드마다, 기본) / link(덱 공용 .css 한 파일)")
+    parser.add_argument("--sizes", type=parse_sizes, default="square",
+                        help=f"출력 규격, 쉼표 구분 ({','.join(OUTPUT_SIZES)} 또는 WxH[@배율][:fit]). "
+                             "한 번 로드한 페이지에서 규격별로 찍음 (기본 square)")
+    parser.add_argument("--plugin", action="append", default=[], metavar="MODULE",
+                        help="슬라이드 타입 플러그인 (모듈 이름 또는 .py 경로, register_slide로 등록). 여러 번 지정 가능")
+    parser.add_argument("--autofit", nargs="?", type=float, const=AUTOFIT_MIN, default=None, metavar="MIN",
+                        help=f"캡처 전에 넘치는 본문 글자 크기를 배율 MIN~1 안에서 줄여 맞춤 (기본 MIN {AUTOFIT_MIN}),"
+                             " 조정한 슬라이드를 보고")
+    parser.add_argument("--deck-doc", action="store_true",
+                        help="슬라이드 전체를 HTML 한 장으로 만들어 한 번 로드 후 섹션별로 캡처")
+    parser.add_argument("--optimize", action="store_true", help="캡처한 PNG를 무손실 재압축 (Pillow)")
+    parser.add_argument("--quantize", action="store_true", help="256색 팔레트로 양자화 후 재압축 (손실, 용량 대폭 감소)")
+    parser.add_argument("--variants", default="", help=f"PNG 옆에 함께 저장할 포맷, 쉼표 구분 ({','.join(IMAGE_VARIANTS)})")
+    parser.add_argument("--quality", type=int, default=90, help="--variants 품질 (기본 90)")
+    parser.add_argument("--force", action="store_true", help=f"{MANIFEST_NAME} 캐시를 무시하고 전부 다시 캡처")
+    parser.add_argument("--report", action="store_true",
+                        help=f"단계별 소요 시간을 {REPORT_NAME}.json / .csv로 저장 (출력 폴더, --batch면 루트)")
+    parser.add_argument("--profile", metavar="FILE", default=None,
+                        help="cProfile로 실행해 통계를 FILE에 저장하고 누적 시간 상위 함수를 출력")
+    return parser.parse_args(argv)
+
+
+def main():
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+
+    args = _parse_args()
+    if not args.profile:
+        return _run(args)
+
+    import cProfile
+    import pstats
+
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(_run, args)
+    finally:
+        profiler.dump_stats(args.profile)
+        print(f"\n프로파일: {args.profile} (상위 20개, 누적 시간순)")
+        pstats.Stats(profiler, stream=sys.stdout).sort_stats("cumulative").print_stats(20)
+
+
+def _run(args) -> int:
+    for name in load_plugins(args.plugin):
+        print(f"  플러그인 슬라이드 타입: {name}")
+    if args.deck_doc and not _is_default_sizes(args.sizes):
+        print("--deck-doc은 기본 규격(square)만 지원합니다 (--sizes와 함께 쓸 수 없음)")
+        return 2
+    if args.deck_doc and args.autofit:
+        print("--deck-doc은 --autofit과 함께 쓸 수 없습니다 (슬라이드별 페이지 로드가 필요)")
+        return 2
+    if args.autofit is not None and not 0 < args.autofit <= 1:
+        print(f"--autofit 최소 배율은 0~1 사이여야 합니다: {args.autofit}")
+        return 2
+
+    if args.serve:
+        return serve(args, args.output_dir or "./output")
+
+    if args.batch:
+        slides_paths = _batch_paths(args.slides_path)
+        if not slides_paths:
+            print(f"대상 slides JSON 없음: {args.slides_path}")
+            return 1
+        return run_batch(slides_paths, args.output_dir or "./output", args)
+
+    slides_path = args.slides_path
+    output_dir = args.output_dir or "./output/부당전보_카드뉴스"
+
+    with open(slides_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    if not args.html_only and not args.deck_doc:
+        # 생성 → 캡처 → 쓰기를 겹쳐서 (변경 없는 슬라이드만 있으면 브라우저도 안 뜸)
+        try:
+            result = run_stream([(data, output_dir)], args)[0]
+        except ImportError:
+            print("  playwright 미설치: pip install playwright && playwright install chromium")
+            return 1
+        if result["error"]:
+            print(f"\n실패: {result['error']}")
+            return 1
+        if args.report:
+            write_render_report([result], output_dir)
+        if not result["changed"]:
+            print(f"\n변경된 슬라이드 없음 ({result['total']}장 모두 캐시)")
+        else:
+            _postprocess([png for t in result["timings"] for png in _timing_pngs(output_dir, t)], args, output_dir)
+            print(f"\nDone! {result['changed']} PNG files created")
+        return 0
+
+    job = build_deck(data, output_dir, _asset_registry(args), args.font, args.font_dir, args.force,
+                     args.css, args.deck_doc, args.sizes, args.autofit)
+    html_files, png_files, total = job["html_files"], job["png_files"], job["total"]
+
+    if args.html_only or not png_files:
+        if args.report:
+            write_render_report([_job_result(job)], output_dir)
+        if not args.html_only:
+            print(f"\n변경된 슬라이드 없음 ({total}장 모두 캐시)")
+        return 0
+
+    print(f"\nPlaywright screenshot... ({len(png_files)}/{total})")
+    t0 = time.perf_counter()
+    try:
+        timings = rasterize(html_files, png_files, pages=args.workers, wait_until=job["wait_until"],
+                            sizes=args.sizes, autofit=args.autofit)
+    except ImportError:
+        print("  playwright 미설치: pip install playwright && playwright install chromium")
+        return 1
+    _save_manifest(output_dir, job["manifest"])
+    if args.report:
+        write_render_report([_job_result(job, timings, round(time.perf_counter() - t0, 4))], output_dir)
+    _postprocess([png for t in timings for png in _timing_pngs(output_dir, t)], args, output_dir)
+    print(f"\nDone! {len(png_files)} PNG files created")
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
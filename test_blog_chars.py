@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+blog_chars 회귀 테스트: 고정값(PINNED_COUNTS)과 실제 원고(*_blog_*.md)를 기존 정규식 구현과 대조
+
+  python -m pytest -q test_blog_chars.py
+"""
+
+import glob
+import os
+import subprocess
+import sys
+
+import pytest
+
+from blog_chars import PINNED_COUNTS, _count_chars_reference, count_chars, count_sections
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+POSTS = sorted(glob.glob(os.path.join(ROOT, "*_blog_*.md")))
+
+# count_chars_temp.py(기존 구현 시절) 출력의 총합 — 엔진을 바꿔도 그대로여야 한다
+COUNT_CHARS_TEMP_TOTAL = 2660
+
+
+def _read(path: str) -> str:
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+@pytest.mark.parametrize("text, expected", PINNED_COUNTS)
+def test_pinned_counts(text, expected):
+    assert count_chars(text) == expected
+    assert _count_chars_reference(text) == expected
+
+
+@pytest.mark.parametrize("path", POSTS, ids=os.path.basename)
+def test_posts_match_reference(path):
+    text = _read(path)
+    assert count_chars(text) == _count_chars_reference(text)
+
+
+@pytest.mark.parametrize("path", POSTS, ids=os.path.basename)
+def test_section_total_matches_whole_post(path):
+    text = _read(path)
+    assert count_sections(text)["total"] == count_chars(text)
+
+
+def test_posts_found():
+    assert POSTS, "루트에 *_blog_*.md 원고가 없음"
+
+
+def test_count_chars_temp_total():
+    out = subprocess.run([sys.executable, os.path.join(ROOT, "count_chars_temp.py")], cwd=ROOT,
+                         capture_output=True, encoding="utf-8", check=True).stdout
+    assert out.rstrip().splitlines()[-1] == f"글자 수: {COUNT_CHARS_TEMP_TOTAL}자"
@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""
+카드뉴스 시각 회귀 테스트: 렌더링한 카드를 골든 이미지(golden/)와 비교
+
+  python visual_regress.py update                         # ./*_slides.json 렌더링 → golden/ 갱신
+  python visual_regress.py check                          # 렌더링 후 golden/과 비교 (다르면 히트맵 + 종료 코드 1)
+  python visual_regress.py check --no-render              # 렌더링 없이 output/<덱>/ 의 기존 PNG를 비교
+  python visual_regress.py check "decks/*_slides.json" -w 8   # 모르는 옵션은 렌더러(render_cards_pw)로 전달
+
+비교는 싼 단계부터 거른다.
+  1. 파일 바이트(sha256)가 같으면 통과 — 같은 HTML이면 Chromium PNG도 같으므로 변경 없는 카드는 디코드도 안 함
+  2. 지각 해시(pHash, 32×32 DCT 64bit) — 골든 쪽 해시는 _golden.json에 저장해 두고 새 카드만 계산.
+     --perceptual N이면 거리가 N을 넘는 카드는 픽셀 비교 없이 바로 실패 (레이아웃이 통째로 바뀐 경우).
+     거리 N 이하라고 통과시키지는 않는다 — pHash는 작은 글자·색 변경을 못 보므로 항상 3단계로 넘김
+  3. NumPy 픽셀 비교 — 채널 최대 차이가 --tolerance 를 넘는 픽셀 비율이 --max-ratio 를 넘으면 실패,
+     <out>/_diff/<덱>/ 에 차이 히트맵(골든을 흐리게 깔고 바뀐 픽셀을 빨갛게) 저장
+NumPy·Pillow가 필요하다 (pip install numpy pillow).
+"""
+
+import argparse
+import functools
+import hashlib
+import io
+import json
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import render_cards_pw as cards
+
+GOLDEN_DIR = "golden"
+GOLDEN_INDEX = "_golden.json"
+REGRESS_DIR = os.path.join("output", "_regress")
+REPORT_NAME = "_regress_report.json"
+DEFAULT_GLOB = "*_slides.json"
+DEFAULT_TOLERANCE = 16        # 채널 차이가 이 이하면 같은 픽셀로 봄 (안티앨리어싱 흔들림)
+DEFAULT_MAX_RATIO = 0.0001    # 1080×1080에서 약 117픽셀
+
+
+# ──────────────────────────────────────────────
+# 해시 · 픽셀 비교
+# ──────────────────────────────────────────────
+
+def _sha(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+@functools.lru_cache(maxsize=1)
+def _dct_matrix():
+    import numpy as np
+
+    n = np.arange(32)
+    return np.cos(np.pi * (2 * n[None, :] + 1) * n[:, None] / 64)
+
+
+def phash(image) -> str:
+    """PIL 이미지 → 64bit pHash (16자리 hex). 32×32 회색조 DCT의 저주파 8×8을 중앙값으로 이진화"""
+    import numpy as np
+    from PIL import Image
+
+    gray = np.asarray(image.convert("L").resize((32, 32), Image.Resampling.BOX), dtype=np.float64)
+    d = _dct_matrix()
+    low = (d @ gray @ d.T)[:8, :8].ravel()
+    bits = low > np.median(low[1:])
+    return f"{int(''.join('1' if b else '0' for b in bits), 2):016x}"
+
+
+def hamming(a: str, b: str) -> int:
+    return bin(int(a, 16) ^ int(b, 16)).count("1")
+
+
+def _load(path: str):
+    from PIL import Image
+
+    with Image.open(path) as im:
+        return im.convert("RGB")
+
+
+def pixel_diff(golden, actual, tolerance: int = DEFAULT_TOLERANCE):
+    """두 RGB 이미지 → (픽셀별 채널 최대 차이 배열, 통계). 크기가 다르면 (None, {"size": ...})"""
+    import numpy as np
+
+    if golden.size != actual.size:
+        return None, {"size": [list(golden.size), list(actual.size)]}
+    # uint8 그대로 |a-b| = max-min (int16 변환·axis 축소보다 몇 배 빠름)
+    a = np.asarray(golden)
+    b = np.asarray(actual)
+    d = np.maximum(a, b)
+    d -= np.minimum(a, b)
+    delta = np.maximum(np.maximum(d[..., 0], d[..., 1]), d[..., 2])
+    mask = delta > tolerance
+    changed = int(np.count_nonzero(mask))
+    stats = {"changed": changed, "ratio": changed / mask.size, "max": int(delta.max())}
+    if changed:
+        rows = np.flatnonzero(mask.any(axis=1))
+        cols = np.flatnonzero(mask.any(axis=0))
+        stats["bbox"] = [int(cols[0]), int(rows[0]), int(cols[-1]) + 1, int(rows[-1]) + 1]
+    return delta, stats
+
+
+def write_heatmap(golden, delta, out_path: str, tolerance: int = DEFAULT_TOLERANCE):
+    """골든을 어둡게 깐 위에 차이를 빨강(허용치 이하는 주황 기미)으로 칠한 PNG"""
+    import numpy as np
+    from PIL import Image
+
+    base = np.asarray(golden.convert("L"), dtype=np.float32) * 0.35
+    heat = np.clip(delta.astype(np.float32) * 4, 0, 255)
+    strong = delta > tolerance
+    rgb = np.stack([np.maximum(base, heat), np.where(strong, base * 0.5, np.maximum(base, heat * 0.4)),
+                    base * np.where(strong, 0.5, 1.0)], axis=2)
+    os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    Image.fromarray(rgb.astype(np.uint8), "RGB").save(out_path, optimize=False)
+
+
+def compare_card(golden_path: str, actual_path: str, golden_entry: dict, opts: dict) -> dict:
+    """카드 1장 비교 (프로세스 워커에서도 호출). status: same / within / changed
+
+    통과(same/within)는 바이트 일치 또는 픽셀 비교로만 판정한다. pHash는 실패를 빨리 내는 데만 쓴다.
+    """
+    sha = _sha(actual_path)
+    if sha == golden_entry.get("sha"):
+        return {"status": "same"}
+    actual = _load(actual_path)
+
+    def distance():
+        return hamming(phash(actual), golden_entry["phash"]) if golden_entry.get("phash") else None
+
+    # pHash는 --perceptual로 크게 바뀐 카드를 바로 떨어뜨릴 때와 실패한 카드의 리포트용으로만 계산
+    result = {}
+    if opts["perceptual"] is not None:
+        result["phash"] = distance()
+        if result["phash"] is not None and result["phash"] > opts["perceptual"]:
+            return {**result, "status": "changed", "prefiltered": True}
+    golden = _load(golden_path)
+    delta, stats = pixel_diff(golden, actual, opts["tolerance"])
+    result.update(stats)
+    if delta is not None and stats["ratio"] <= opts["max_ratio"]:
+        return {**result, "status": "within"}
+    if "phash" not in result:
+        result["phash"] = distance()
+    if delta is not None:
+        result["heatmap"] = opts["heatmap"]
+        write_heatmap(golden, delta, opts["heatmap"], opts["tolerance"])
+    return {**result, "status": "changed"}
+
+
+def _compare_job(job):
+    return job["key"], compare_card(job["golden"], job["actual"], job["entry"], job["opts"])
+
+
+def compare_all(jobs: list, procs: int = 0) -> dict:
+    """[{"key", "golden", "actual", "entry", "opts"}] → {key: 결과}. 카드가 많으면 디코드·비교를 프로세스로 나눔"""
+    procs = procs or min(8, os.cpu_count() or 1)
+    if procs > 1 and len(jobs) >= 16:
+        with ProcessPoolExecutor(max_workers=procs) as pool:
+            return dict(pool.map(_compare_job, jobs, chunksize=8))
+    return dict(map(_compare_job, jobs))
+
+
+# ──────────────────────────────────────────────
+# 골든 · 렌더링
+# ──────────────────────────────────────────────
+
+def _load_index(golden_dir: str) -> dict:
+    try:
+        with open(os.path.join(golden_dir, GOLDEN_INDEX), "r", encoding="utf-8") as f:
+            return json.load(f).get("cards", {})
+    except (OSError, ValueError, AttributeError):
+        return {}
+
+
+def _save_index(golden_dir: str, entries: dict):
+    path = os.path.join(golden_dir, GOLDEN_INDEX)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"version": 1, "cards": dict(sorted(entries.items()))}, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+
+def _deck_pngs(deck_dir: str) -> list:
+    """덱 출력 폴더의 카드 PNG 이름 (리포트·캐시 등 _ 로 시작하는 파일 제외)"""
+    try:
+        return sorted(n for n in os.listdir(deck_dir) if n.endswith(".png") and not n.startswith("_"))
+    except OSError:
+        return []
+
+
+def render(slides_paths: list, output_root: str, render_cli: list) -> dict:
+    """slides JSON들을 output_root/<덱>/ 에 렌더링 (렌더 캐시 유지 → 바뀐 슬라이드만 캡처). {덱: 오류}"""
+    args = cards._parse_args(["_"] + render_cli)
+    cards.load_plugins(args.plugin)
+    decks = []
+    for path in slides_paths:
+        with open(path, "r", encoding="utf-8") as f:
+            decks.append((json.load(f), os.path.join(output_root, cards._deck_name(path))))
+    results = cards.run_stream(decks, args)
+    return {cards._deck_name(path): r["error"] for path, r in zip(slides_paths, results)}
+
+
+def update_golden(deck_names: list, actual_root: str, golden_dir: str) -> dict:
+    """actual_root/<덱>/ PNG → golden_dir/<덱>/ 복사 + sha·pHash 색인. 덱에서 사라진 카드는 골든에서도 제거"""
+    entries = _load_index(golden_dir)
+    counts = {"copied": 0, "kept": 0, "removed": 0}
+    for deck in deck_names:
+        src_dir = os.path.join(actual_root, deck)
+        dst_dir = os.path.join(golden_dir, deck)
+        os.makedirs(dst_dir, exist_ok=True)
+        pngs = _deck_pngs(src_dir)
+        for name in _deck_pngs(dst_dir):
+            if name not in pngs:
+                os.remove(os.path.join(dst_dir, name))
+                entries.pop(f"{deck}/{name}", None)
+                counts["removed"] += 1
+        for name in pngs:
+            src = os.path.join(src_dir, name)
+            sha = _sha(src)
+            key = f"{deck}/{name}"
+            if entries.get(key, {}).get("sha") == sha and os.path.exists(os.path.join(dst_dir, name)):
+                counts["kept"] += 1
+                continue
+            shutil.copyfile(src, os.path.join(dst_dir, name))
+            image = _load(src)
+            entries[key] = {"sha": sha, "phash": phash(image), "size": list(image.size)}
+            counts["copied"] += 1
+    _save_index(golden_dir, entries)
+    return counts
+
+
+def check(deck_names: list, actual_root: str, golden_dir: str, opts: dict, procs: int = 0) -> dict:
+    """덱별 카드를 골든과 비교 → {"cards": {key: 결과}, "missing": [...], "new": [...]}"""
+    entries = _load_index(golden_dir)
+    diff_root = os.path.join(actual_root, "_diff")
+    jobs, missing, new = [], [], []
+    for deck in deck_names:
+        golden_names = {k.split("/", 1)[1] for k in entries if k.split("/", 1)[0] == deck}
+        actual_names = set(_deck_pngs(os.path.join(actual_root, deck)))
+        missing += [f"{deck}/{n}" for n in sorted(golden_names - actual_names)]
+        new += [f"{deck}/{n}" for n in sorted(actual_names - golden_names)]
+        for name in sorted(golden_names & actual_names):
+            key = f"{deck}/{name}"
+            jobs.append({"key": key, "golden": os.path.join(golden_dir, deck, name),
+                         "actual": os.path.join(actual_root, deck, name), "entry": entries[key],
+                         "opts": {**opts, "heatmap": os.path.join(diff_root, deck, name[:-4] + "_diff.png")}})
+    if os.path.isdir(diff_root):
+        shutil.rmtree(diff_root)  # 지난 실행의 히트맵이 남아 헷갈리지 않게
+    return {"cards": compare_all(jobs, procs), "missing": missing, "new": new}
+
+
+def main() -> int:
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+
+    parser = argparse.ArgumentParser(description="카드뉴스 시각 회귀 테스트 (골든 이미지 비교)")
+    parser.add_argument("command", choices=("check", "update"))
+    parser.add_argument("slides", nargs="?", default=DEFAULT_GLOB,
+                        help=f"slides JSON glob 또는 목록 파일 .txt/.json (기본 {DEFAULT_GLOB})")
+    parser.add_argument("--golden", default=GOLDEN_DIR, help=f"골든 이미지 폴더 (기본 {GOLDEN_DIR})")
+    parser.add_argument("--out", default=None,
+                        help=f"렌더링 출력 루트 (기본 {REGRESS_DIR}, --no-render면 ./output)")
+    parser.add_argument("--no-render", action="store_true", help="렌더링하지 않고 <out>/<덱>/ 의 기존 PNG 사용")
+    parser.add_argument("--tolerance", type=int, default=DEFAULT_TOLERANCE,
+                        help=f"같은 픽셀로 볼 채널 차이 (0~255, 기본 {DEFAULT_TOLERANCE})")
+    parser.add_argument("--max-ratio", type=float, default=DEFAULT_MAX_RATIO,
+                        help=f"허용할 바뀐 픽셀 비율 (기본 {DEFAULT_MAX_RATIO})")
+    parser.add_argument("--perceptual", type=int, default=None, metavar="N",
+                        help="pHash 거리가 N을 넘으면 픽셀 비교·히트맵 없이 바로 실패 (대규모 변경을 빨리 훑을 때)")
+    parser.add_argument("--procs", type=int, default=0, help="비교 프로세스 수 (기본 CPU 수, 최대 8)")
+    args, render_cli = parser.parse_known_args()
+
+    try:
+        import numpy  # noqa: F401
+        import PIL  # noqa: F401
+    except ImportError:
+        print("NumPy·Pillow 미설치: pip install numpy pillow")
+        return 1
+
+    slides_paths = cards._batch_paths(args.slides)
+    if not slides_paths:
+        print(f"대상 slides JSON 없음: {args.slides}")
+        return 1
+    deck_names = [cards._deck_name(p) for p in slides_paths]
+    actual_root = args.out or ("output" if args.no_render else REGRESS_DIR)
+
+    if args.no_render and not os.path.isdir(actual_root):
+        print(f"비교할 렌더링 결과 폴더가 없음: {actual_root} (--out 확인, 또는 --no-render 없이 실행)")
+        return 1
+
+    t0 = time.perf_counter()
+    if not args.no_render:
+        print(f"렌더링 {len(slides_paths)}개 덱 → {actual_root}")
+        try:
+            errors = render(slides_paths, actual_root, render_cli)
+        except ImportError:
+            print("  playwright 미설치: pip install playwright && playwright install chromium"
+                  " (기존 PNG로 비교하려면 --no-render)")
+            return 1
+        failed = {deck: e for deck, e in errors.items() if e}
+        for deck, error in failed.items():
+            print(f"  렌더링 실패 {deck}: {error}")
+        if failed:
+            return 1
+    render_seconds = time.perf_counter() - t0
+
+    if args.command == "update":
+        counts = update_golden(deck_names, actual_root, args.golden)
+        print(f"골든 갱신 {args.golden}: 새로 복사 {counts['copied']} · 그대로 {counts['kept']}"
+              f" · 제거 {counts['removed']}")
+        return 0
+
+    t1 = time.perf_counter()
+    opts = {"tolerance": args.tolerance, "max_ratio": args.max_ratio, "perceptual": args.perceptual}
+    result = check(deck_names, actual_root, args.golden, opts, args.procs)
+    compare_seconds = time.perf_counter() - t1
+
+    cards_result = result["cards"]
+    counts = {s: sum(1 for r in cards_result.values() if r["status"] == s)
+              for s in ("same", "within", "changed")}
+    os.makedirs(actual_root, exist_ok=True)
+    with open(os.path.join(actual_root, REPORT_NAME), "w", encoding="utf-8") as f:
+        json.dump({"golden": args.golden, "options": opts, "counts": counts, **result}, f,
+                  ensure_ascii=False, indent=2)
+
+    for key, r in sorted(cards_result.items()):
+        if r["status"] != "changed":
+            continue
+        if "size" in r:
+            print(f"  ✗ {key}  크기 다름 {r['size'][0]} → {r['size'][1]}")
+            continue
+        if r.get("prefiltered"):
+            print(f"  ✗ {key}  pHash 거리 {r['phash']} > {args.perceptual} (픽셀 비교 생략)")
+            continue
+        print(f"  ✗ {key}  {r['ratio'] * 100:.3f}% ({r['changed']}px, 최대 {r['max']})"
+              f" · 영역 {r['bbox']} · pHash 거리 {r['phash']}")
+        print(f"      {r['heatmap']}")
+    for key in result["missing"]:
+        print(f"  ✗ {key}  렌더링 결과 없음")
+    for key in result["new"]:
+        print(f"  ? {key}  골든 없음 (update로 추가)")
+
+    total = len(cards_result)
+    print(f"\n{total}장 비교 {compare_seconds:.2f}s (렌더링 {render_seconds:.2f}s): 동일 {counts['same']}"
+          f" · 허용 범위 {counts['within']} · 변경 {counts['changed']}"
+          f" · 누락 {len(result['missing'])} · 골든 없음 {len(result['new'])}")
+    print(f"리포트: {os.path.join(actual_root, REPORT_NAME)}")
+    return 1 if counts["changed"] or result["missing"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())